@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.core.exceptions import ImproperlyConfigured
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_asgi_application()
+
+# Under ASGI queries run in ever-changing threads, so persistent
+# connections are never reused and pile up; pool them (DB_POOL) instead.
+for alias, database in settings.DATABASES.items():
+    if database.get('CONN_MAX_AGE'):
+        raise ImproperlyConfigured(
+            f"DATABASES['{alias}']['CONN_MAX_AGE'] must be 0 under ASGI, "
+            f"set DB_CONN_MAX_AGE=0 or DB_POOL=true."
+        )
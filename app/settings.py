@@ -45,8 +45,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
-    'rest_framework.authtoken',
     'drf_spectacular',
     'core',
     'user',
@@ -95,12 +95,54 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST'),
         'PORT': env('DB_PORT'),
+        # Connections are checked before reuse, whether persistent or pooled.
+        'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
     }
 }
 
+# DB_POOL=true hands connections out from psycopg's pool; otherwise each
+# thread keeps its connection open for DB_CONN_MAX_AGE seconds (0, the
+# default, closes it after every request). Only pool under ASGI, where
+# persistent connections are refused (see app/asgi.py).
+if env.bool('DB_POOL', default=False):
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env.int(
+        'DB_CONN_MAX_AGE', default=0
+    )
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# The default cache holds auth tokens, their invalidations and book list
+# generations, so in production it must be shared by every process (web
+# workers, the renditions worker, management commands): set CACHE_URL to
+# Redis or Memcached. The process-local default only suits development and
+# tests; `manage.py check --deploy` reports it (core.E001).
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+# The PBKDF2 work factor defaults to Django's. Changing it (or putting
+# another hasher first) rehashes passwords on the next successful login.
+PASSWORD_HASHERS = env.list('PASSWORD_HASHERS', default=[
+    'user.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+])
+PASSWORD_HASH_ITERATIONS = env.int('PASSWORD_HASH_ITERATIONS', default=None)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -143,5 +185,69 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend']
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # JSON is encoded and decoded with orjson when it is installed.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'login': env('LOGIN_THROTTLE_RATE', default='10/min'),
+    },
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
+
+# Auth tokens expire once unused for TOKEN_EXPIRY seconds. Their last use
+# is recorded at most once per TOKEN_REFRESH_INTERVAL seconds.
+TOKEN_EXPIRY = env.int('TOKEN_EXPIRY', default=30 * 24 * 60 * 60)
+TOKEN_REFRESH_INTERVAL = env.int('TOKEN_REFRESH_INTERVAL', default=15 * 60)
+
+# Opt in to issuing stateless signed tokens (valid for SIGNED_TOKEN_MAX_AGE
+# seconds) from the token endpoint instead of database tokens.
+SIGNED_TOKENS = env.bool('SIGNED_TOKENS', default=False)
+SIGNED_TOKEN_MAX_AGE = env.int('SIGNED_TOKEN_MAX_AGE', default=15 * 60)
+
+# Resolved auth tokens are cached in each worker (short-lived, bounded LRU)
+# and in the shared cache above. Timeouts are in seconds.
+TOKEN_AUTH_CACHE_TIMEOUT = env.int('TOKEN_AUTH_CACHE_TIMEOUT', default=300)
+TOKEN_AUTH_LOCAL_CACHE_TIMEOUT = env.int(
+    'TOKEN_AUTH_LOCAL_CACHE_TIMEOUT', default=10
+)
+TOKEN_AUTH_LOCAL_CACHE_SIZE = env.int(
+    'TOKEN_AUTH_LOCAL_CACHE_SIZE', default=10000
+)
+
+# Threads hashing passwords for token requests in each web process, and
+# seconds a failed email/password pair is rejected without hashing.
+LOGIN_HASH_WORKERS = env.int('LOGIN_HASH_WORKERS', default=4)
+LOGIN_FAILURE_CACHE_TIMEOUT = env.int(
+    'LOGIN_FAILURE_CACHE_TIMEOUT', default=300
+)
+
+# Seconds a rendered book list page stays cached for its user.
+BOOK_LIST_CACHE_TIMEOUT = env.int('BOOK_LIST_CACHE_TIMEOUT', default=300)
+# Seconds a user's book generation lives, so a bump that never reached the
+# cache stops serving stale lists (and 304s) after at most this long.
+BOOK_GENERATION_TIMEOUT = env.int('BOOK_GENERATION_TIMEOUT', default=3600)
+# Seconds the genre and author list versions live, likewise.
+CATALOG_VERSION_TIMEOUT = env.int('CATALOG_VERSION_TIMEOUT', default=3600)
+# Seconds each process batches its book list cache hit/miss counts before
+# adding them to the shared totals of the cache stats.
+BOOK_CACHE_STATS_INTERVAL = env.int('BOOK_CACHE_STATS_INTERVAL', default=10)
+
+# Threads resizing uploaded book images in each web process. Set to 0 to
+# leave the work to `manage.py process_renditions` instead.
+BOOK_IMAGE_RENDITION_WORKERS = env.int(
+    'BOOK_IMAGE_RENDITION_WORKERS', default=2
+)
+
+# Limits enforced while a book image upload streams in.
+BOOK_IMAGE_MAX_BYTES = env.int('BOOK_IMAGE_MAX_BYTES', default=10 * 1024 * 1024)
+BOOK_IMAGE_MAX_DIMENSION = env.int('BOOK_IMAGE_MAX_DIMENSION', default=8000)
+
+# Seconds an unreferenced book image is kept before it may be deleted.
+BOOK_IMAGE_ORPHAN_GRACE = env.int('BOOK_IMAGE_ORPHAN_GRACE', default=600)
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the book API.
+
+Each module is a standalone script, run from the project root with e.g.
+``python -m benchmarks.book_filters``. Benchmarks run against a separate
+``test_<DB_NAME>`` database created from the configured settings.
+"""
@@ -0,0 +1,192 @@
+"""
+Load test the book and catalog reads under ASGI and WSGI.
+
+Starts the app under uvicorn (``app.asgi``) and under a threaded WSGI
+server (gunicorn ``gthread`` when installed, else ``runserver``), then
+holds an increasing number of keep-alive connections open against each,
+requesting book pages, book details and genre lists in a loop. Reports
+throughput, latency and failed requests per connection count. Servers
+whose package is not installed are skipped.
+
+    python -m benchmarks.asgi_load --keepdb --connections 10 100 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.book_filters import seed
+from benchmarks.utils import benchmark_database, report, setup_django
+
+CONNECTIONS = (10, 100, 500)
+HOST = "127.0.0.1"
+
+
+def server_commands(port, workers, threads):
+    """Return the available server commands by name."""
+    commands = {}
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        print("uvicorn is not installed, skipping ASGI.")
+    else:
+        commands["asgi uvicorn"] = [
+            sys.executable, "-m", "uvicorn", "app.asgi:application",
+            "--host", HOST, "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ]
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        commands["wsgi runserver"] = [
+            sys.executable, "manage.py", "runserver", f"{HOST}:{port}",
+            "--noreload", "--skip-checks",
+        ]
+    else:
+        commands["wsgi gunicorn"] = [
+            sys.executable, "-m", "gunicorn", "app.wsgi:application",
+            "--bind", f"{HOST}:{port}", "--workers", str(workers),
+            "--worker-class", "gthread", "--threads", str(threads),
+            "--log-level", "warning",
+        ]
+    return commands
+
+
+def wait_for_port(port, timeout=30):
+    """Block until something listens on the port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"Server did not start on port {port}.")
+
+
+async def fetch(reader, writer, path, token):
+    """Send one GET request and return its status code."""
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Authorization: Token {token}\r\n\r\n".encode()
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(
+        line.lower().split(": ", 1) for line in lines[1:] if ": " in line
+    )
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return int(lines[0].split()[1])
+
+
+async def client(port, paths, token, deadline, durations, failures):
+    """Request random paths over one connection until the deadline."""
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+    except OSError:
+        failures.append("connect")
+        return
+    rng = random.Random()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await fetch(reader, writer, rng.choice(paths), token)
+            if status == 200:
+                durations.append((time.perf_counter() - start) * 1000)
+            else:
+                failures.append(status)
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        failures.append("connection")
+    finally:
+        writer.close()
+
+
+async def load(port, paths, token, connections, seconds):
+    """Run the clients and return the durations and failures."""
+    durations, failures = [], []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*[
+        client(port, paths, token, deadline, durations, failures)
+        for _ in range(connections)
+    ])
+    return durations, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--connections", type=int, nargs="+", default=list(CONNECTIONS)
+    )
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--threads", type=int, default=8,
+        help="Threads per gunicorn worker."
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--keepdb", action="store_true",
+        help="Keep the seeded database for the next run."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from book.models import Book
+    from user.models import Token
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        seed(connection, args.books, 1, 50, 20_000)
+        book = Book.objects.order_by("id").first()
+        token, _ = Token.objects.get_or_create(user=book.user)
+        book_ids = list(
+            Book.objects.filter(user=book.user).values_list("id", flat=True)
+        )
+        rng = random.Random(0)
+        paths = (
+            [f"/api/book/books/?page_size={size}" for size in (10, 50, 100)]
+            + [f"/api/book/books/{pk}/" for pk in rng.sample(book_ids, 100)]
+            + ["/api/catalog/genres/"]
+        )
+
+        env = {**os.environ, "DB_NAME": connection.settings_dict["NAME"]}
+        commands = server_commands(args.port, args.workers, args.threads)
+        for name, command in commands.items():
+            print(f"\n== {name} ==")
+            server = subprocess.Popen(
+                command, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                wait_for_port(args.port)
+                for connections in args.connections:
+                    durations, failures = asyncio.run(load(
+                        args.port, paths, token.key, connections,
+                        args.seconds
+                    ))
+                    print(
+                        f"{connections:>5} connections: "
+                        f"{len(durations) / args.seconds:8.1f} req/s, "
+                        f"{len(failures)} failed"
+                    )
+                    if durations:
+                        report(f"{name} x{connections}", durations)
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark the genre/author filters of the book list.
+
+Compares the former JOIN + DISTINCT filtering against the EXISTS based
+BookFilter on a generated catalog (1M books by default) and prints the
+query plans and timings of fetching the first page.
+
+    python -m benchmarks.book_filters --books 1000000 --keepdb
+"""
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database,
+    measure,
+    report,
+    setup_django,
+)
+
+PAGE_SIZE = 50
+
+
+def seed(connection, books, users, genres, authors):
+    """Fill the database with generated books using set-based SQL."""
+    from django.contrib.auth import get_user_model
+
+    from book.models import Book
+    from catalog.models import Genre, Author
+
+    if Book.objects.exists():
+        return
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(email=f"user{i}@example.com", name=f"User {i}")
+        for i in range(users)
+    )
+    Genre.objects.bulk_create(Genre(name=f"Genre {i}") for i in range(genres))
+    Author.objects.bulk_create(
+        Author(name=f"Author {i}") for i in range(authors)
+    )
+
+    user_ids = list(User.objects.values_list("id", flat=True))
+    genre_ids = list(Genre.objects.values_list("id", flat=True))
+    author_ids = list(Author.objects.values_list("id", flat=True))
+    genre_through = Book.genres.through._meta.db_table
+    author_through = Book.authors.through._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Book._meta.db_table}
+                (user_id, title, description, price, link, updated_at,
+                 renditions, genres_snapshot, authors_snapshot)
+            SELECT (%s::bigint[])[1 + i %% %s], 'Book ' || i, '', 9.99, '',
+                now(), '{{}}', '[]', '[]'
+            FROM generate_series(1, %s) AS i
+            """,
+            [user_ids, len(user_ids), books]
+        )
+        for table, column, ids, per_book in (
+            (genre_through, "genre_id", genre_ids, 3),
+            (author_through, "author_id", author_ids, 2),
+        ):
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (book_id, {column})
+                SELECT DISTINCT b.id,
+                    (%s::bigint[])[1 + floor(random() * %s)::int]
+                FROM {Book._meta.db_table} b,
+                    generate_series(1, 1 + floor(random() * %s)::int)
+                """,
+                [ids, len(ids), per_book]
+            )
+    Book.objects.refresh_snapshots()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def legacy_queryset(user, genres, authors):
+    """Return the book list query as filtered before the EXISTS rewrite."""
+    from book.models import Book
+
+    queryset = Book.objects.filter(user=user).order_by("-id").distinct()
+    if genres:
+        queryset = queryset.filter(genres__name__in=genres).distinct()
+    if authors:
+        queryset = queryset.filter(authors__name__in=authors).distinct()
+    return queryset
+
+
+def filtered_queryset(user, genres, authors, match):
+    """Return the book list query filtered by BookFilter."""
+    from book.filters import BookFilter
+    from book.models import Book
+
+    data = {"match": match}
+    if genres:
+        data["genres"] = ",".join(genres)
+    if authors:
+        data["authors"] = ",".join(authors)
+    queryset = Book.objects.filter(user=user).order_by("-id")
+    return BookFilter(data, queryset=queryset).qs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--genres", type=int, default=50)
+    parser.add_argument("--authors", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--keepdb", action="store_true",
+        help="Keep the seeded database for the next run."
+    )
+    parser.add_argument(
+        "--plans", action="store_true",
+        help="Print EXPLAIN ANALYZE output for every query."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        seed(connection, args.books, args.users, args.genres, args.authors)
+        user = get_user_model().objects.order_by("id").first()
+
+        cases = {
+            "3 genres": (["Genre 1", "Genre 2", "Genre 3"], []),
+            "3 genres + 3 authors": (
+                ["Genre 1", "Genre 2", "Genre 3"],
+                ["Author 1", "Author 2", "Author 3"],
+            ),
+        }
+        for label, (genres, authors) in cases.items():
+            print(f"\n== {label} ==")
+            querysets = {
+                "join + distinct": legacy_queryset(user, genres, authors),
+                "exists (match=any)": filtered_queryset(
+                    user, genres, authors, "any"
+                ),
+                "exists (match=all)": filtered_queryset(
+                    user, genres, authors, "all"
+                ),
+            }
+            for name, queryset in querysets.items():
+                page = queryset[:PAGE_SIZE + 1]
+                report(name, measure(lambda: list(page.all()), args.repeat))
+                if args.plans:
+                    print(page.explain(analyze=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the serialization of book lists.
+
+Compares ``BookSerializer`` on model instances against the fast read path
+(``BookListReadSerializer`` on ``values()`` rows) used by the list view,
+for 1k/10k/100k books, including the query fetching them. Both outputs
+are checked to render identically before timing.
+
+    python -m benchmarks.book_serializers --keepdb
+"""
+import argparse
+
+from benchmarks.book_filters import seed
+from benchmarks.utils import (
+    benchmark_database,
+    measure,
+    report,
+    setup_django,
+)
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(SIZES)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--keepdb", action="store_true",
+        help="Keep the seeded database for the next run."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from book.models import Book
+    from book.serializers import BookListReadSerializer, BookSerializer
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        if not Book.objects.exists():
+            seed(connection, max(args.sizes), 1, 50, 20_000)
+
+        request = Request(APIRequestFactory().get("/api/book/books/"))
+        context = {"request": request}
+        queryset = Book.objects.order_by("-id")
+
+        def serialize(size):
+            books = queryset[:size]
+            return BookSerializer(books, many=True, context=context).data
+
+        def serialize_rows(size):
+            rows = BookListReadSerializer.get_rows(queryset)[:size]
+            return BookListReadSerializer(
+                rows, many=True, context=context
+            ).data
+
+        renderer = JSONRenderer()
+        sample = min(args.sizes)
+        if renderer.render(serialize(sample)) != renderer.render(
+            serialize_rows(sample)
+        ):
+            raise SystemExit("Fast path output differs from BookSerializer.")
+
+        for size in args.sizes:
+            print(f"\n== {size} books ==")
+            for name, func in (
+                ("BookSerializer", serialize),
+                ("BookListReadSerializer", serialize_rows),
+            ):
+                durations = measure(
+                    lambda: func(size), args.repeat, warmup=1
+                )
+                report(name, durations)
+                print(f"{'':<40} {size / min(durations) * 1000:,.0f} books/s")
+
+
+if __name__ == "__main__":
+    main()
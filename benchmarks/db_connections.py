@@ -0,0 +1,96 @@
+"""
+Benchmark book list latency per database connection mode.
+
+Sends /api/book/books/ requests through Django's WSGI handler, so
+connections are opened and released as in a real server, with the list
+cache disabled. Compares a new connection per request (CONN_MAX_AGE=0),
+persistent connections with health checks and psycopg's connection pool
+(skipped unless psycopg[pool] is installed). Set DB_HOST to a TCP host to
+include the network, TLS and auth handshake in the new-connection cost.
+
+    python -m benchmarks.db_connections --keepdb
+"""
+import argparse
+import io
+import random
+
+from benchmarks.book_filters import seed
+from benchmarks.utils import (
+    benchmark_database,
+    measure,
+    report,
+    setup_django,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument(
+        "--keepdb", action="store_true",
+        help="Keep the seeded database for the next run."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    from django.test import override_settings
+
+    from book.models import Book
+    from user.models import Token
+
+    modes = {
+        "new connection per request": {"CONN_MAX_AGE": 0},
+        "persistent + health checks": {
+            "CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True
+        },
+    }
+    if is_psycopg3:
+        modes["psycopg pool"] = {
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {"pool": {"min_size": 2, "max_size": 10}},
+        }
+    else:
+        print("psycopg 3 is not installed, skipping the pool.")
+
+    with benchmark_database(keepdb=args.keepdb) as connection:
+        seed(connection, args.books, 1, 50, 20_000)
+        user = Book.objects.order_by("id").first().user
+        token, _ = Token.objects.get_or_create(user=user)
+        original = {**connection.settings_dict, "OPTIONS": {}}
+        handler = WSGIHandler()
+        rng = random.Random(0)
+
+        def request():
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": "/api/book/books/",
+                "QUERY_STRING": f"page_size={rng.randint(10, 100)}",
+                "SERVER_NAME": "localhost",
+                "SERVER_PORT": "80",
+                "HTTP_HOST": "localhost",
+                "HTTP_AUTHORIZATION": f"Token {token.key}",
+                "wsgi.url_scheme": "http",
+                "wsgi.input": io.BytesIO(),
+            }
+            response = handler(environ, lambda status, headers: None)
+            if response.status_code != 200:
+                raise SystemExit(f"Request failed: {response.status_code}")
+            # Closing the response sends request_finished, which releases
+            # or closes the connection depending on the mode.
+            response.close()
+
+        with override_settings(BOOK_LIST_CACHE_TIMEOUT=0):
+            for label, options in modes.items():
+                connection.close()
+                connection.settings_dict.update(original, **options)
+                report(label, measure(request, args.repeat, warmup=20))
+                connection.close()
+                connection.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the import_books command.
+
+Writes a generated NDJSON catalog (100k books by default, each with two
+genres and an author drawn from small pools) and imports it into a
+throwaway database, once per worker count, printing books per second.
+
+    python -m benchmarks.import_books --books 100000 --workers 0 4
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def write_catalog(path, books, genres, authors):
+    """Write a generated NDJSON catalog."""
+    rng = random.Random(0)
+    with open(path, "w") as file:
+        for i in range(books):
+            file.write(json.dumps({
+                "title": f"Book {i}",
+                "description": f"Generated description of book {i}",
+                "price": f"{rng.randint(100, 9999) / 100:.2f}",
+                "link": f"http://example.com/books/{i}.pdf",
+                "genres": [
+                    f"Genre {rng.randrange(genres)}" for _ in range(2)
+                ],
+                "authors": [{"name": f"Author {rng.randrange(authors)}"}],
+            }) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--genres", type=int, default=200)
+    parser.add_argument("--authors", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    from book import importer
+    from book.models import Book
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "books.ndjson")
+        write_catalog(path, args.books, args.genres, args.authors)
+
+        with benchmark_database():
+            user = get_user_model().objects.create_user(
+                email="import@example.com", password="benchmark"
+            )
+            for workers in args.workers:
+                Book.objects.all().delete()
+                start = time.perf_counter()
+                with open(path) as file:
+                    for _ in importer.import_books(
+                        file, "ndjson", user,
+                        chunk_size=args.chunk_size, workers=workers
+                    ):
+                        pass
+                elapsed = time.perf_counter() - start
+                print(
+                    f"workers {workers:<3} {args.books} books in "
+                    f"{elapsed:6.2f} s  {args.books / elapsed:8.0f} books/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark rendering and parsing of book list JSON.
+
+Compares DRF's JSONRenderer/JSONParser against FastJSONRenderer and
+FastJSONParser on /api/book/books/ pages of generated books (the default
+page, the largest page and a large unpaginated payload). No database is
+needed.
+
+    python -m benchmarks.json_renderer
+"""
+import argparse
+import io
+import random
+
+from benchmarks.utils import measure, report, setup_django
+
+SIZES = (50, 500, 10_000)
+
+
+def book_page(size, seed=0):
+    """Return a book list page shaped like the list endpoint output."""
+    rng = random.Random(seed)
+    base = "http://testserver/media/renditions"
+    results = []
+    for book_id in range(size, 0, -1):
+        digest = f"{rng.getrandbits(128):032x}"
+        results.append({
+            "id": book_id,
+            "title": f"Book {book_id} – {rng.choice(['Dune', 'Émile'])}",
+            "price": f"{rng.randint(100, 99999) / 100:.2f}",
+            "link": f"https://example.com/books/{book_id}.pdf",
+            "genres": [
+                {"id": genre, "name": f"Genre {genre}"}
+                for genre in rng.sample(range(1, 50), rng.randint(1, 3))
+            ],
+            "authors": [
+                {"id": author, "name": f"Author {author}"}
+                for author in rng.sample(range(1, 20_000), rng.randint(1, 2))
+            ],
+            "renditions": {
+                size_name: {
+                    ext: f"{base}/{digest[:2]}/{digest}-{size_name}.{ext}"
+                    for ext in ("webp", "jpg")
+                }
+                for size_name in ("thumbnail", "medium")
+            },
+        })
+    return {
+        "next": "http://testserver/api/book/books/?cursor=cD0xMjM0",
+        "previous": None,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(SIZES)
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.parsers import FastJSONParser
+    from core.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print("orjson is not installed, FastJSONRenderer uses json.")
+
+    for size in args.sizes:
+        data = book_page(size)
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            raise SystemExit("FastJSONRenderer output differs.")
+
+        print(f"\n== {size} books ({len(body) / 1024:,.0f} KiB) ==")
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            report(
+                f"render {type(renderer).__name__}",
+                measure(lambda: renderer.render(data), args.repeat)
+            )
+        for json_parser in (JSONParser(), FastJSONParser()):
+            report(
+                f"parse {type(json_parser).__name__}",
+                measure(
+                    lambda: json_parser.parse(io.BytesIO(body)), args.repeat
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    """Configure Django from the project settings."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """Run the block against a throwaway copy of the configured database.
+
+    With ``keepdb`` the database (and any seeded fixture) is reused by the
+    next run instead of being destroyed.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+
+
+def measure(func, repeat=20, warmup=2):
+    """Call func repeatedly and return the durations in milliseconds."""
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def percentile(durations, percent):
+    """Return the given percentile of a list of durations."""
+    ordered = sorted(durations)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def report(label, durations):
+    """Print a one-line summary of the durations."""
+    print(
+        f"{label:<40} "
+        f"p50 {statistics.median(durations):9.2f} ms  "
+        f"p99 {percentile(durations, 99):9.2f} ms  "
+        f"min {min(durations):9.2f} ms"
+    )
@@ -0,0 +1,118 @@
+"""
+Per-user response cache for the book list.
+
+Every user has a "book generation", a timestamp stored in the cache that
+is bumped whenever one of their books (or a genre/author on them)
+changes. Cached list responses are keyed by that generation, so a bump
+invalidates all of a user's cached pages at once. The same key doubles
+as the ETag of book responses.
+Bumps happen once the changes are committed, and generations expire after
+BOOK_GENERATION_TIMEOUT seconds, so a bump that was lost does not leave
+stale responses forever.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.cache import LocalCounter
+
+STATS_KEYS = {
+    "hits": "book-list-cache:hits",
+    "misses": "book-list-cache:misses",
+}
+
+# Hits and misses are counted per process and added to the shared totals
+# once per interval, rather than with two cache writes per request.
+local_stats = LocalCounter(settings.BOOK_CACHE_STATS_INTERVAL)
+
+
+def generation_key(user_id):
+    """Return the cache key of a user's book generation."""
+    return f"book-generation:{user_id}"
+
+
+async def aget_book_generation(user_id):
+    """Return the current book generation of a user."""
+    key = generation_key(user_id)
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(
+            key, time.time_ns(), settings.BOOK_GENERATION_TIMEOUT
+        )
+        generation = await cache.aget(key)
+    return generation
+
+
+def bump_book_generation(*user_ids):
+    """Invalidate the cached book lists of the given users.
+
+    The bump waits for the current transaction to commit, so a list read
+    before then cannot be cached under the new generation.
+    """
+    user_ids = set(user_ids)
+
+    def bump():
+        generation = time.time_ns()
+        cache.set_many(
+            {generation_key(user_id): generation for user_id in user_ids},
+            settings.BOOK_GENERATION_TIMEOUT
+        )
+
+    transaction.on_commit(bump)
+
+
+def book_cache_key(request, generation):
+    """Return the cache key of a book request at a given generation."""
+    params = sorted(request.query_params.lists())
+    digest = hashlib.sha256(
+        repr((request.build_absolute_uri(request.path), params)).encode()
+    ).hexdigest()
+    return f"book-list:{request.user.pk}:{generation}:{digest}"
+
+
+async def aget_cached_book_list(cache_key):
+    """Return the cached response data for a key, counting hits/misses."""
+    data = await cache.aget(cache_key)
+    counts = local_stats.add("misses" if data is None else "hits")
+    if counts:
+        await aadd_stats(counts)
+    return data
+
+
+async def aset_cached_book_list(cache_key, data):
+    """Cache the response data of a book list request."""
+    await cache.aset(cache_key, data, settings.BOOK_LIST_CACHE_TIMEOUT)
+
+
+def add_stats(counts):
+    """Add hit/miss counts of this process to the shared totals."""
+    for stat, count in counts.items():
+        cache.add(STATS_KEYS[stat], 0, None)
+        cache.incr(STATS_KEYS[stat], count)
+        # Some backends reset the timeout in incr().
+        cache.touch(STATS_KEYS[stat], None)
+
+
+async def aadd_stats(counts):
+    """Async counterpart of ``add_stats()``."""
+    for stat, count in counts.items():
+        await cache.aadd(STATS_KEYS[stat], 0, None)
+        await cache.aincr(STATS_KEYS[stat], count)
+        await cache.atouch(STATS_KEYS[stat], None)
+
+
+def get_cache_stats():
+    """Return the hit and miss counts of the book list cache.
+
+    Counts of other processes show up once they report them, at most
+    BOOK_CACHE_STATS_INTERVAL seconds late.
+    """
+    add_stats(local_stats.take())
+    counts = cache.get_many(STATS_KEYS.values())
+    stats = {stat: counts.get(key, 0) for stat, key in STATS_KEYS.items()}
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else None
+    return stats
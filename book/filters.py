@@ -1,20 +1,68 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Exists, F, FloatField, OuterRef
+from django.db.models.functions import Cast
 from django_filters import rest_framework as filters
 
 from book.models import Book
+from catalog.models import Genre, Author
 
 
 class BookFilter(filters.FilterSet):
+    q = filters.CharFilter(method="filter_search")
     genres = filters.CharFilter(method="filter_genres")
     authors = filters.CharFilter(method="filter_authors")
+    match = filters.ChoiceFilter(
+        choices=[("any", "any"), ("all", "all")],
+        method="filter_match"
+    )
 
     class Meta:
         model = Book
-        fields = ['genres', 'authors']
+        fields = ['q', 'genres', 'authors', 'match']
+
+    def filter_search(self, queryset, name, value):
+        """Keep books matching the search terms, annotated with their rank.
+
+        The rank is cast to double precision so pagination cursors compare
+        equal to the rank they were read from.
+        """
+        query = SearchQuery(value, config="english", search_type="websearch")
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=Cast(
+                SearchRank(F("search_vector"), query), FloatField()
+            )
+        )
 
     def filter_genres(self, queryset, name, value):
-        genre_names = value.split(',')
-        return queryset.filter(genres__name__in=genre_names).distinct()
+        return self._filter_tags(queryset, Genre, value)
 
     def filter_authors(self, queryset, name, value):
-        author_names = value.split(',')
-        return queryset.filter(authors__name__in=author_names).distinct()
+        return self._filter_tags(queryset, Author, value)
+
+    def filter_match(self, queryset, name, value):
+        """The match mode is applied by the genre and author filters."""
+        return queryset
+
+    def _filter_tags(self, queryset, model, value):
+        """Keep books linked to any (or all) of the comma-separated names.
+
+        Each condition is an EXISTS subquery instead of a join, so books
+        are never duplicated and no DISTINCT is needed.
+        """
+        names = {
+            name.strip().lower() for name in value.split(',') if name.strip()
+        }
+        if not names:
+            return queryset
+
+        def linked_to(tag_names):
+            return Exists(
+                model.objects.filter_names(tag_names).filter(book=OuterRef("pk"))
+            )
+
+        if self.form.cleaned_data.get("match") == "all":
+            for tag_name in names:
+                queryset = queryset.filter(linked_to([tag_name]))
+            return queryset
+
+        return queryset.filter(linked_to(names))
@@ -0,0 +1,199 @@
+"""
+Streaming import of books from CSV or NDJSON files.
+
+Records are read lazily and handled in chunks: each chunk is validated
+with ``BookSerializer`` (optionally in worker processes) and written by
+``BookBulkSerializer`` with bulk inserts inside one transaction. The
+number of records consumed is checkpointed after every committed chunk,
+so an interrupted import can resume where it stopped.
+"""
+import collections
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+
+import django
+from django.db import IntegrityError, connections, transaction
+
+from book.cache import bump_book_generation
+from book.serializers import BookSerializer
+
+FIELDS = ("title", "description", "price", "link")
+TAG_FIELDS = ("genres", "authors")
+# Genres and authors kept between chunks before the cache is reset.
+TAG_CACHE_SIZE = 100_000
+
+
+def read_records(file, file_format):
+    """Yield the raw records of a CSV or NDJSON file."""
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+    else:
+        for line in file:
+            if line.strip():
+                yield line
+
+
+def to_book_data(record):
+    """Return the serializer input of a raw record.
+
+    CSV records hold genre and author names separated by ``|``, as written
+    by the export. NDJSON records hold lists of names or of objects with a
+    ``name``.
+    """
+    if isinstance(record, str):
+        record = json.loads(record)
+
+    data = {
+        field: record[field] for field in FIELDS
+        if record.get(field) not in (None, "")
+    }
+    for field in TAG_FIELDS:
+        value = record.get(field) or []
+        if isinstance(value, str):
+            value = value.split("|")
+        names = [
+            item["name"] if isinstance(item, dict) else item
+            for item in value
+        ]
+        data[field] = [{"name": name} for name in names if name.strip()]
+
+    return data
+
+
+def validate_chunk(chunk):
+    """Validate a chunk of raw records.
+
+    ``chunk`` is a pair of the offset of its first record and the records.
+    Returns the offset after the chunk, the validated books and the errors
+    of the other records as pairs of record offset and messages.
+    """
+    start, records = chunk
+    books, errors = [], []
+    for offset, record in enumerate(records, start):
+        try:
+            books.append((offset, to_book_data(record)))
+        except (ValueError, TypeError, AttributeError, KeyError) as exc:
+            errors.append((offset, {"non_field_errors": [str(exc)]}))
+
+    end = start + len(records)
+    serializer = BookSerializer(data=[data for _, data in books], many=True)
+    if serializer.is_valid():
+        return end, list(serializer.validated_data), errors
+
+    valid = []
+    for (offset, data), error in zip(books, serializer.errors):
+        if error:
+            errors.append((offset, error))
+        else:
+            valid.append(data)
+
+    serializer = BookSerializer(data=valid, many=True)
+    serializer.is_valid(raise_exception=True)
+    return end, list(serializer.validated_data), sorted(errors)
+
+
+def init_worker():
+    """Set up Django in a validation worker process."""
+    django.setup()
+
+
+def imap_bounded(pool, func, iterable, ahead):
+    """Like ``pool.imap()``, but reading at most ``ahead`` items early.
+
+    ``Pool.imap()`` consumes its input as fast as it can, which would
+    pull the whole file into memory.
+    """
+    pending = collections.deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= ahead:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def chunked(records, size, start=0):
+    """Yield (offset, records) pairs of up to ``size`` records each."""
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def save_books(user, books, tag_cache=None):
+    """Write validated books for a user in bulk."""
+    serializer = BookSerializer(many=True, context={"tag_cache": tag_cache})
+    return serializer.create([dict(attrs, user=user) for attrs in books])
+
+
+def write_checkpoint(path, offset):
+    """Atomically record the number of records consumed."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump({"offset": offset}, file)
+    os.replace(temp_path, path)
+
+
+def read_checkpoint(path):
+    """Return the number of records consumed by a previous run."""
+    try:
+        with open(path) as file:
+            return json.load(file)["offset"]
+    except FileNotFoundError:
+        return 0
+
+
+def import_books(file, file_format, user, chunk_size=1000, offset=0,
+                 workers=0, checkpoint=None):
+    """Import the books of a file for a user, yielding per-chunk results.
+
+    The first ``offset`` records are skipped. With ``workers``, chunks are
+    validated in that many processes while the main process writes. Each
+    result is a triple of the offset after the chunk, the number of books
+    written and the validation errors of the chunk. The checkpoint is
+    written once a chunk is committed, so a crash in between repeats that
+    chunk on resume.
+    """
+    records = itertools.islice(read_records(file, file_format), offset, None)
+    chunks = chunked(records, chunk_size, start=offset)
+    if not workers:
+        yield from write_chunks(map(validate_chunk, chunks), user, checkpoint)
+        return
+
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        results = imap_bounded(pool, validate_chunk, chunks, workers * 2)
+        yield from write_chunks(results, user, checkpoint)
+
+
+def write_chunks(results, user, checkpoint):
+    """Write validated chunks, each in its own transaction."""
+    tag_cache = {}
+    for end, books, errors in results:
+        if sum(map(len, tag_cache.values())) > TAG_CACHE_SIZE:
+            tag_cache.clear()
+        try:
+            write_chunk(user, books, end, checkpoint, tag_cache)
+        except IntegrityError:
+            # A cached genre or author was deleted meanwhile.
+            tag_cache.clear()
+            write_chunk(user, books, end, checkpoint, tag_cache)
+        if books:
+            bump_book_generation(user.pk)
+        yield end, len(books), errors
+
+
+def write_chunk(user, books, end, checkpoint, tag_cache):
+    """Write the books of a chunk and checkpoint its end once committed."""
+    with transaction.atomic():
+        if books:
+            save_books(user, books, tag_cache)
+        if checkpoint is not None:
+            transaction.on_commit(lambda: write_checkpoint(checkpoint, end))
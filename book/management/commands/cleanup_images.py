@@ -0,0 +1,67 @@
+"""
+Django command to delete book images no book refers to.
+"""
+import os
+import re
+
+from django.core.management.base import BaseCommand
+
+from book import renditions
+from book.models import Book
+
+RENDITION_NAME = re.compile(
+    r"^(?P<stem>.+)_(?:%s)\.(?:%s)$" % (
+        "|".join(renditions.SIZES), "|".join(renditions.FORMATS)
+    )
+)
+
+
+class Command(BaseCommand):
+    """Django command to delete book images no book refers to."""
+
+    help = "Delete orphaned book images and their renditions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=None,
+            help="Keep files modified within this many seconds "
+                 "(default BOOK_IMAGE_ORPHAN_GRACE).",
+        )
+
+    def handle(self, *args, **options):
+        storage = Book._meta.get_field("image").storage
+        paths = list(self.walk(storage, os.path.join("uploads", "book")))
+        stems = {
+            os.path.splitext(path)[0] for path in paths
+            if not RENDITION_NAME.match(os.path.basename(path))
+        }
+
+        # Renditions go with their original, unless that is already gone.
+        names = []
+        for path in paths:
+            match = RENDITION_NAME.match(os.path.basename(path))
+            stem = match and os.path.join(os.path.dirname(path), match["stem"])
+            if match is None or stem not in stems:
+                names.append(path)
+
+        released = []
+        for start in range(0, len(names), 1000):
+            released += renditions.release_images(
+                *names[start:start + 1000], grace=options["grace"]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {len(released)} orphaned images")
+        )
+
+    def walk(self, storage, directory):
+        """Yield the paths of all files below a storage directory."""
+        if not storage.exists(directory):
+            return
+        directories, files = storage.listdir(directory)
+        for name in files:
+            yield os.path.join(directory, name)
+        for name in directories:
+            yield from self.walk(storage, os.path.join(directory, name))
@@ -0,0 +1,101 @@
+"""
+Django command to import books from a CSV or NDJSON file.
+"""
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from book import importer
+
+
+class Command(BaseCommand):
+    """Django command to import books from a CSV or NDJSON file."""
+
+    help = (
+        "Import books for a user from a CSV or NDJSON file, in chunks. "
+        "Progress is checkpointed so an interrupted import can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Email of the user owning the imported books.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="File format (default from the file extension).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Books validated and written per transaction "
+                 "(default 1000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Processes validating chunks in parallel (default none).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file (default <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the records imported by a previous run.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or os.path.splitext(path)[1][1:]
+        if file_format not in ("csv", "ndjson", "jsonl"):
+            raise CommandError(
+                "Cannot tell the file format, pass --format csv|ndjson."
+            )
+
+        try:
+            user = get_user_model().objects.get(email=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist.")
+
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+        offset = importer.read_checkpoint(checkpoint) if options["resume"] else 0
+        if offset:
+            self.stdout.write(f"Resuming after {offset} records")
+
+        imported = skipped = 0
+        started = time.monotonic()
+        with open(path, newline="", encoding="utf-8") as file:
+            results = importer.import_books(
+                file,
+                "csv" if file_format == "csv" else "ndjson",
+                user,
+                chunk_size=options["chunk_size"],
+                offset=offset,
+                workers=options["workers"],
+                checkpoint=checkpoint,
+            )
+            for end, count, errors in results:
+                imported += count
+                skipped += len(errors)
+                for record, error in errors:
+                    self.stderr.write(f"Record {record + 1}: {error}")
+                rate = imported / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(
+                    f"{end} records read, {imported} books imported, "
+                    f"{skipped} skipped ({rate:.0f} books/s)"
+                )
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} books, skipped {skipped} invalid records"
+        ))
@@ -0,0 +1,55 @@
+"""
+Django command to generate pending book image renditions.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from book import renditions
+
+
+class Command(BaseCommand):
+    """Django command to generate pending book image renditions."""
+
+    help = "Generate missing book image renditions, polling for new uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no renditions are pending.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls (default 5).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Books to process per poll (default 100).",
+        )
+
+    def handle(self, *args, **options):
+        failed = set()
+        while True:
+            book_ids = list(
+                renditions.pending_books().exclude(pk__in=failed).values_list(
+                    "pk", flat=True
+                )[:options["batch_size"]]
+            )
+            for book_id in book_ids:
+                try:
+                    renditions.generate_renditions(book_id)
+                except Exception as exc:
+                    failed.add(book_id)
+                    self.stderr.write(f"Book {book_id}: {exc}")
+                else:
+                    self.stdout.write(f"Book {book_id}: renditions generated")
+
+            if not book_ids:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0005_book_image'),
+        ('catalog', '0003_author'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['user', '-id'], name='book_user_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:32
+
+import book.models
+import book.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0009_book_renditions'),
+        ('catalog', '0008_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='image',
+            field=models.ImageField(null=True, storage=book.storage.book_image_storage, upload_to=book.models.book_image_file_path),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['image'], name='book_image_idx'),
+        ),
+    ]
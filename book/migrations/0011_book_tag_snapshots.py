@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:46
+
+from django.db import migrations, models
+
+from book.models import BookQuerySet
+
+
+def fill_snapshots(apps, schema_editor):
+    Book = apps.get_model("book", "Book")
+    BookQuerySet(model=Book).refresh_snapshots()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0010_book_image_content_addressed'),
+        ('catalog', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='authors_snapshot',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='genres_snapshot',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.RunPython(fill_snapshots, migrations.RunPython.noop),
+    ]
@@ -2,18 +2,55 @@
 Book database models.
 """
 import os
-import uuid
 
 from django.conf import settings
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, JSONObject
+
+from book.storage import book_image_storage, file_digest
 
 
 def book_image_file_path(instance, filename):
-    """Generate file path for new book image"""
-    ext = os.path.splitext(filename)[1]  # keeps original file extension
-    filename = f"{uuid.uuid4()}{ext}"
+    """Generate a content-addressed file path for a book image"""
+    ext = os.path.splitext(filename)[1].lower()
+    digest = file_digest(instance.image.file)
+
+    return os.path.join("uploads", "book", digest[:2], f"{digest}{ext}")
+
+
+class BookQuerySet(models.QuerySet):
+    """QuerySet for books."""
 
-    return os.path.join("uploads", "book", filename)
+    snapshot_fields = ("genres", "authors")
+
+    def refresh_snapshots(self, *fields):
+        """Recompute the genre/author snapshots from the link tables."""
+        values = {}
+        for name in fields or self.snapshot_fields:
+            field = self.model._meta.get_field(name)
+            book_column = field.m2m_field_name()
+            tag_column = field.m2m_reverse_field_name()
+            snapshot = field.remote_field.through.objects.filter(
+                **{book_column: OuterRef("pk")}
+            ).values(book_column).annotate(
+                data=JSONBAgg(
+                    JSONObject(
+                        id=F(f"{tag_column}_id"),
+                        name=F(f"{tag_column}__name")
+                    ),
+                    order_by="id"
+                )
+            ).values("data")
+            values[f"{name}_snapshot"] = Coalesce(
+                Subquery(snapshot),
+                Value([], output_field=models.JSONField())
+            )
+
+        return self.update(**values)
 
 
 class Book(models.Model):
@@ -28,7 +65,80 @@ class Book(models.Model):
     link = models.CharField(max_length=255)
     genres = models.ManyToManyField("catalog.Genre")
     authors = models.ManyToManyField("catalog.Author")
-    image = models.ImageField(null=True, upload_to=book_image_file_path)
+    # Copies of the genres and authors ({"id", "name"} in link order), so
+    # listing books needs no joins. Kept current by book/signals.py.
+    genres_snapshot = models.JSONField(default=list, editable=False)
+    authors_snapshot = models.JSONField(default=list, editable=False)
+    image = models.ImageField(
+        null=True,
+        upload_to=book_image_file_path,
+        storage=book_image_storage
+    )
+    renditions = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("description", weight="B", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = BookQuerySet.as_manager()
+
+    # Columns written by queryset updates of their own (the snapshot
+    # signals and rendition jobs), which full saves leave alone.
+    background_field_names = (
+        "genres_snapshot", "authors_snapshot", "renditions"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-id"], name="book_user_id_idx"),
+            models.Index(fields=["image"], name="book_image_idx"),
+            GinIndex(fields=["search_vector"], name="book_search_vector_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+    def save(self, **kwargs):
+        """Save the book, leaving the snapshots and renditions alone.
+
+        They are written separately, by the signals keeping the snapshots
+        current and by the rendition jobs, so a full save of an existing
+        book must not overwrite them with the (possibly stale) copies
+        loaded with the instance. Pass ``update_fields`` to write them.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.name not in self.background_field_names
+            ]
+        super().save(**kwargs)
+
+    def get_snapshot(self, name):
+        """Return the snapshot of the genres or authors of the book."""
+        field = self._meta.get_field(name)
+        tag_column = f"{field.m2m_reverse_field_name()}_id"
+        rows = field.remote_field.through.objects.filter(
+            **{field.m2m_field_name(): self}
+        ).order_by("id").values_list(
+            tag_column, f"{field.m2m_reverse_field_name()}__name"
+        )
+        return [{"id": tag_id, "name": tag_name} for tag_id, tag_name in rows]
+
+    def refresh_snapshot(self, name):
+        """Store the current snapshot of the genres or authors."""
+        snapshot = self.get_snapshot(name)
+        setattr(self, f"{name}_snapshot", snapshot)
+        Book.objects.filter(pk=self.pk).update(
+            **{f"{name}_snapshot": snapshot}
+        )
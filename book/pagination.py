@@ -0,0 +1,19 @@
+"""
+Pagination for the book APIs.
+"""
+from core.pagination import AsyncCursorPagination
+
+
+class BookCursorPagination(AsyncCursorPagination):
+    """Keyset pagination over books, newest first."""
+    ordering = "-id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        """Order search results by relevance, newest first among equals."""
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", "-id")
+
+        return super().get_ordering(request, queryset, view)
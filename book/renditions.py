@@ -0,0 +1,173 @@
+"""
+Background generation of resized book image renditions, and cleanup of
+images no longer used by any book.
+
+Uploads only store the original and mark the book as pending (empty
+``renditions``). The resizing happens on a small in-process thread pool
+once the upload is committed, or in the ``process_renditions`` worker
+when ``BOOK_IMAGE_RENDITION_WORKERS`` is 0. The worker also picks up jobs
+lost when a web process restarts.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from book.cache import bump_book_generation
+from book.models import Book
+
+logger = logging.getLogger(__name__)
+
+SIZES = {
+    "thumbnail": (200, 300),
+    "medium": (600, 900),
+}
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def rendition_path(image_name, size, ext):
+    """Return the storage path of a rendition of an image."""
+    stem = os.path.splitext(image_name)[0]
+    return f"{stem}_{size}.{ext}"
+
+
+def render(image, size, ext):
+    """Return the encoded bytes of an image fitted into a size."""
+    image_format, options = FORMATS[ext]
+    resized = image.copy()
+    resized.thumbnail(SIZES[size], Image.LANCZOS)
+
+    output = io.BytesIO()
+    resized.save(output, format=image_format, **options)
+    return output.getvalue()
+
+
+def generate_renditions(book_id):
+    """Write the renditions of a book's image and record their paths.
+
+    Renditions are named after the content-addressed original, so ones
+    already written for another book with the same image are reused.
+    """
+    book = Book.objects.filter(pk=book_id).only("user", "image").first()
+    if book is None or not book.image:
+        return None
+
+    storage = book.image.storage
+    image = None
+    renditions = {}
+    for size in SIZES:
+        for ext in FORMATS:
+            path = rendition_path(book.image.name, size, ext)
+            if not storage.exists(path):
+                if image is None:
+                    image = open_image(book.image)
+                storage.save(path, ContentFile(render(image, size, ext)))
+            renditions.setdefault(size, {})[ext] = path
+
+    # Skip the update if another image was uploaded in the meantime.
+    updated = Book.objects.filter(
+        pk=book_id, image=book.image.name
+    ).update(renditions=renditions)
+    if updated:
+        bump_book_generation(book.user_id)
+
+    return renditions
+
+
+def open_image(field_file):
+    """Return the decoded, upright RGB image of a stored file."""
+    with field_file.open("rb") as image_file:
+        image = ImageOps.exif_transpose(Image.open(image_file))
+        return image.convert("RGB")
+
+
+def image_paths(name):
+    """Return the storage paths of an original image and its renditions."""
+    return [name] + [
+        rendition_path(name, size, ext) for size in SIZES for ext in FORMATS
+    ]
+
+
+def release_images(*names, grace=None):
+    """Delete stored images no book refers to anymore, with renditions.
+
+    Images written or re-uploaded within the grace period are kept, as a
+    book that is being saved with the same content may not be committed
+    yet. ``manage.py cleanup_images`` collects those later.
+    """
+    if grace is None:
+        grace = settings.BOOK_IMAGE_ORPHAN_GRACE
+
+    names = set(filter(None, names))
+    names -= set(Book.objects.filter(image__in=names).values_list(
+        "image", flat=True
+    ))
+
+    storage = Book._meta.get_field("image").storage
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    released = []
+    for name in names:
+        if not storage.exists(name):
+            continue
+        if storage.get_modified_time(name) > cutoff:
+            continue
+        for path in image_paths(name):
+            storage.delete(path)
+        released.append(name)
+
+    return released
+
+
+def pending_books():
+    """Return books with an image whose renditions are missing."""
+    return Book.objects.filter(renditions={}).exclude(image="").exclude(
+        image__isnull=True
+    )
+
+
+def get_executor():
+    """Return the shared thread pool, or None when a worker is used."""
+    global _executor
+
+    if settings.BOOK_IMAGE_RENDITION_WORKERS <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BOOK_IMAGE_RENDITION_WORKERS,
+                thread_name_prefix="renditions"
+            )
+    return _executor
+
+
+def run_job(book_id):
+    """Generate renditions for a book on a pool thread, logging failures."""
+    close_old_connections()
+    try:
+        generate_renditions(book_id)
+    except Exception:
+        logger.exception("Could not generate renditions of book %s", book_id)
+    finally:
+        close_old_connections()
+
+
+def enqueue_renditions(book):
+    """Schedule rendition generation once the upload is committed."""
+    executor = get_executor()
+    if executor is not None:
+        transaction.on_commit(lambda: executor.submit(run_job, book.pk))
@@ -0,0 +1,101 @@
+"""
+Signal handlers keeping genre/author snapshots current, invalidating
+cached book lists and removing stale files.
+"""
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.db import transaction
+from django.dispatch import receiver
+
+from book.cache import bump_book_generation
+from book.renditions import release_images
+from book.models import Book
+from catalog.models import Genre, Author
+
+TAG_FIELDS = {Genre: "genres", Author: "authors"}
+THROUGH_FIELDS = {
+    Book.genres.through: "genres",
+    Book.authors.through: "authors",
+}
+
+
+def bump_tag_users(tag_model, tag_ids):
+    """Invalidate the book lists of users with books having these tags."""
+    bump_book_users(Book.objects.filter(
+        **{f"{TAG_FIELDS[tag_model]}__in": tag_ids}
+    ))
+
+
+def bump_book_users(books):
+    """Invalidate the book lists of the owners of these books."""
+    bump_book_generation(
+        *books.values_list("user_id", flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def book_changed(sender, instance, **kwargs):
+    bump_book_generation(instance.user_id)
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    if instance.image:
+        name = instance.image.name
+        transaction.on_commit(lambda: release_images(name))
+
+
+@receiver(m2m_changed, sender=Book.genres.through)
+@receiver(m2m_changed, sender=Book.authors.through)
+def book_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    name = THROUGH_FIELDS[sender]
+    if not reverse:
+        if action.startswith("post_"):
+            instance.refresh_snapshot(name)
+            bump_book_generation(instance.user_id)
+    elif action == "pre_clear":
+        instance._cleared_book_ids = list(
+            Book.objects.filter(**{name: instance}).values_list(
+                "id", flat=True
+            )
+        )
+    elif action == "post_clear":
+        books = Book.objects.filter(id__in=instance._cleared_book_ids)
+        books.refresh_snapshots(name)
+        bump_book_users(books)
+    elif action in ("post_add", "post_remove") and pk_set:
+        books = Book.objects.filter(id__in=pk_set)
+        books.refresh_snapshots(name)
+        bump_book_users(books)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Author)
+def tag_renamed(sender, instance, created, **kwargs):
+    if not created:
+        name = TAG_FIELDS[sender]
+        Book.objects.filter(**{name: instance}).refresh_snapshots(name)
+        bump_tag_users(sender, [instance.pk])
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Author)
+def tag_deleted(sender, instance, **kwargs):
+    instance._snapshot_book_ids = list(
+        Book.objects.filter(**{TAG_FIELDS[sender]: instance}).values_list(
+            "id", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Author)
+def tag_removed(sender, instance, **kwargs):
+    books = Book.objects.filter(id__in=instance._snapshot_book_ids)
+    books.refresh_snapshots(TAG_FIELDS[sender])
+    bump_book_users(books)
@@ -0,0 +1,49 @@
+"""
+Content-addressed storage for book images.
+"""
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+
+def file_digest(file):
+    """Return the SHA-256 hex digest of a file's content.
+
+    Uploads hashed while streaming carry a ``content_digest`` and are not
+    read again.
+    """
+    digest = getattr(file, "content_digest", None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in file.chunks():
+            hasher.update(chunk)
+        file.seek(0)
+        digest = hasher.hexdigest()
+
+    return digest
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage keeping one copy of each file name.
+
+    Names are derived from the content, so saving a name that already
+    exists keeps the stored file (refreshing its modification time, which
+    protects it from orphan cleanup) instead of writing a copy.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def _save(self, name, content):
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+
+        return super()._save(name, content)
+
+
+def book_image_storage():
+    """Return the storage of book images."""
+    return ContentAddressedStorage()
@@ -1,13 +1,20 @@
 """
 Tests for book APIs
 """
+import csv
+import io
+import json
 import os
 import tempfile
 from decimal import Decimal
+from unittest.mock import patch
 
 from PIL import Image
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -18,9 +25,14 @@ from book.models import (
 from book.serializers import (
     BookSerializer, BookDetailSerializer
 )
+from book.uploads import BoundedImageUploadHandler, RequestEntityTooLarge
+from book.views import BookViewSet
 from catalog.models import Genre, Author
+from user.models import Token
 
 BOOK_URL = reverse("book:book-list")
+BULK_URL = reverse("book:book-bulk")
+EXPORT_URL = reverse("book:book-export")
 
 
 def create_user(**params):
@@ -85,7 +97,100 @@ class PrivateBookAPITests(TestCase):
 
         books = Book.objects.all().order_by("-id")
         serializer = BookSerializer(books, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_list_books_query_count_is_constant(self):
+        """Test listing books reads genres and authors from the book rows."""
+        def create_tagged_book(index):
+            book = create_book(user=self.user, title=f"Book {index}")
+            book.genres.add(Genre.objects.create(name=f"Genre {index}"))
+            book.authors.add(Author.objects.create(name=f"Author {index}"))
+
+        create_tagged_book(0)
+        with self.assertNumQueries(1):
+            res = self.client.get(BOOK_URL)
+        self.assertEqual(len(res.data["results"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(1, 10):
+                create_tagged_book(index)
+        with self.assertNumQueries(1):
+            res = self.client.get(BOOK_URL)
+        self.assertEqual(len(res.data["results"]), 10)
+
+    def test_list_books_is_paginated(self):
+        """Test the book list is returned in pages, newest first."""
+        books = [create_book(user=self.user, title=f"Book {i}") for i in range(5)]
+
+        res = self.client.get(BOOK_URL, {"page_size": 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]],
+            [books[4].id, books[3].id]
+        )
+        self.assertIsNone(res.data["previous"])
+        self.assertIsNotNone(res.data["next"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]],
+            [books[2].id, books[1].id]
+        )
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]],
+            [books[0].id]
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_list_books_page_keyed_on_id(self):
+        """Test pages are fetched by id range rather than offset."""
+        for i in range(3):
+            create_book(user=self.user, title=f"Book {i}")
+        res = self.client.get(BOOK_URL, {"page_size": 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(res.data["next"])
+
+        book_query = queries.captured_queries[0]["sql"]
+        self.assertIn('"book_book"."id" <', book_query)
+        self.assertNotIn("OFFSET", book_query)
+
+    def test_list_fast_path_matches_book_serializer(self):
+        """Test the list renders byte-identical to BookSerializer."""
+        book = create_book(user=self.user, title="Dünë", price=Decimal("5.5"))
+        book.genres.add(Genre.objects.create(name="Sci-Fi"))
+        book.authors.add(
+            Author.objects.create(name="Frank"),
+            Author.objects.create(name="Brian")
+        )
+        book.renditions = {"thumbnail": {"webp": "renditions/1.webp"}}
+        book.save()
+        create_book(user=self.user, price=Decimal("120"))
+
+        res = self.client.get(BOOK_URL)
+
+        books = Book.objects.order_by("-id")
+        serializer = BookSerializer(
+            books, many=True, context={"request": res.wsgi_request}
+        )
+        renderer = res.accepted_renderer
+        self.assertEqual(
+            renderer.render(res.data["results"]),
+            renderer.render(serializer.data)
+        )
+
+    def test_get_book_detail_reads_snapshots(self):
+        """Test book detail reads genres and authors from the book row."""
+        book = create_book(user=self.user)
+        book.genres.add(*[Genre.objects.create(name=f"G{i}") for i in range(3)])
+        book.authors.add(*[Author.objects.create(name=f"A{i}") for i in range(3)])
+
+        with self.assertNumQueries(1):
+            res = self.client.get(detail_url(book.id))
+        self.assertEqual(len(res.data["genres"]), 3)
+        self.assertEqual(len(res.data["authors"]), 3)
 
     def test_book_list_limited_to_user(self):
         """Test list of books is limited to authenticated user."""
@@ -102,7 +207,7 @@ class PrivateBookAPITests(TestCase):
 
         books = Book.objects.filter(user=self.user)
         serializer = BookSerializer(books, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_get_book_detail(self):
         """Test get book detail"""
@@ -506,6 +611,179 @@ class PrivateBookAPITests(TestCase):
         book.refresh_from_db()
         self.assertEqual(book.authors.count(), 0)
 
+    def test_update_query_count_independent_of_tag_count(self):
+        """Test updating tags costs the same queries for few or many tags."""
+        def update_tags(book, count):
+            payload = {
+                "genres": [{"name": f"Genre {i}"} for i in range(count)],
+                "authors": [{"name": f"Author {i}"} for i in range(count)],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.patch(
+                    detail_url(book.id), payload, format="json"
+                )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(book.genres.count(), count)
+            self.assertEqual(book.authors.count(), count)
+            return len(queries)
+
+        few = update_tags(create_book(user=self.user), 2)
+        many = update_tags(create_book(user=self.user), 10)
+        self.assertEqual(few, many)
+
+    def test_update_keeps_unchanged_tags(self):
+        """Test updating tags only touches the genres that changed."""
+        book = create_book(user=self.user)
+        fantasy = Genre.objects.create(name="Fantasy")
+        history = Genre.objects.create(name="History")
+        book.genres.add(fantasy, history)
+        through = Book.genres.through
+        kept_row = through.objects.get(book=book, genre=fantasy)
+
+        payload = {"genres": [{"name": "fantasy"}, {"name": "Memoir"}]}
+        res = self.client.patch(detail_url(book.id), payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            set(book.genres.values_list("name", flat=True)),
+            {"Fantasy", "Memoir"}
+        )
+        self.assertTrue(through.objects.filter(id=kept_row.id).exists())
+
+
+class BulkBookAPITests(TestCase):
+    """Test creating and updating books in bulk."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email="user@example.com",
+            password="userpass123"
+        )
+        self.client.force_authenticate(self.user)
+
+    def book_payload(self, index, **params):
+        """Return a payload for one book of a batch."""
+        payload = {
+            "title": f"Book {index}",
+            "price": "5.00",
+            "link": f"https://example.com/{index}.pdf",
+            "genres": [{"name": "fantasy"}, {"name": f"Genre {index}"}],
+            "authors": [{"name": f"author {index}"}],
+        }
+        payload.update(params)
+        return payload
+
+    def test_bulk_create_books(self):
+        """Test creating many books with their genres and authors."""
+        Genre.objects.create(name="Fantasy")
+        payload = [self.book_payload(i) for i in range(3)]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [book["title"] for book in res.data],
+            ["Book 0", "Book 1", "Book 2"]
+        )
+
+        books = Book.objects.filter(user=self.user)
+        self.assertEqual(books.count(), 3)
+        self.assertEqual(Genre.objects.filter(name="Fantasy").count(), 1)
+        for book in books:
+            index = book.title.split()[-1]
+            self.assertEqual(
+                set(book.genres.values_list("name", flat=True)),
+                {"Fantasy", f"Genre {index}"}
+            )
+            self.assertEqual(
+                list(book.authors.values_list("name", flat=True)),
+                [f"Author {index}"]
+            )
+
+    def test_bulk_create_query_count_is_constant(self):
+        """Test the number of queries does not grow with the batch size."""
+        payload = [self.book_payload(i) for i in range(2)]
+        with CaptureQueriesContext(connection) as small_batch:
+            self.client.post(BULK_URL, payload, format="json")
+
+        payload = [self.book_payload(i) for i in range(2, 22)]
+        with CaptureQueriesContext(connection) as large_batch:
+            res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(large_batch), len(small_batch))
+
+    def test_bulk_update_books(self):
+        """Test updating existing books and replacing their tags."""
+        book = create_book(user=self.user, title="Old title")
+        book.genres.add(Genre.objects.create(name="History"))
+
+        payload = [
+            self.book_payload(0, id=book.id, genres=[{"name": "Memoir"}]),
+            self.book_payload(1),
+        ]
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data[0]["id"], book.id)
+
+        book.refresh_from_db()
+        self.assertEqual(book.title, "Book 0")
+        self.assertEqual(
+            list(book.genres.values_list("name", flat=True)),
+            ["Memoir"]
+        )
+        self.assertEqual(Book.objects.filter(user=self.user).count(), 2)
+
+    def test_bulk_update_other_users_book_error(self):
+        """Test another user's book can not be updated in bulk."""
+        other_user = create_user(email="user2@example.com", password="test123")
+        book = create_book(user=other_user, title="Other title")
+
+        payload = [self.book_payload(0, id=book.id), self.book_payload(1)]
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        book.refresh_from_db()
+        self.assertEqual(book.title, "Other title")
+        self.assertFalse(Book.objects.filter(user=self.user).exists())
+
+    def test_bulk_invalid_id_error(self):
+        """Test ids that are not integers are rejected."""
+        payload = [
+            self.book_payload(0, id="abc"),
+            self.book_payload(1, id=[1]),
+        ]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", res.data[0])
+        self.assertIn("id", res.data[1])
+
+    def test_bulk_duplicate_id_error(self):
+        """Test a book can only appear once in a batch."""
+        book = create_book(user=self.user, title="Old title")
+        payload = [
+            self.book_payload(0, id=book.id),
+            self.book_payload(1, id=str(book.id)),
+        ]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("id", res.data[1])
+        book.refresh_from_db()
+        self.assertEqual(book.title, "Old title")
+
+    def test_bulk_invalid_book_creates_nothing(self):
+        """Test one invalid book rejects the whole batch."""
+        payload = [self.book_payload(0), self.book_payload(1, price="")]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("price", res.data[1])
+        self.assertFalse(Book.objects.exists())
+
 
 class ImageUploadTest(TestCase):
     """Tests for the image upload API."""
@@ -549,3 +827,161 @@ class ImageUploadTest(TestCase):
 
         res = self.client.post(url, payload, format="multipart")
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def upload_image(self, size=(10, 10), image_format="JPEG", **params):
+        """Upload a generated image and return the response."""
+        url = image_upload_url(self.recipe.id)
+        suffix = f".{image_format.lower()}"
+        with tempfile.NamedTemporaryFile(suffix=suffix) as image_file:
+            Image.effect_noise(size, 100).convert("RGB").save(
+                image_file, format=image_format, **params
+            )
+            image_file.seek(0)
+            return self.client.post(
+                url, {"image": image_file}, format="multipart"
+            )
+
+    def test_upload_image_large_metadata(self):
+        """Test a header behind metadata spanning many chunks is found."""
+        res = self.upload_image(icc_profile=os.urandom(120 * 1024))
+
+        self.recipe.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(BOOK_IMAGE_MAX_BYTES=1024)
+    def test_upload_image_too_large(self):
+        """Test uploads over the byte limit are rejected with 413."""
+        res = self.upload_image(size=(200, 200))
+
+        self.assertEqual(
+            res.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+        self.recipe.refresh_from_db()
+        self.assertFalse(self.recipe.image)
+
+    def test_upload_image_too_large_while_streaming(self):
+        """Test the byte limit holds without a usable Content-Length."""
+        handler = BoundedImageUploadHandler()
+        handler.new_file("image", "cover.jpg", "image/jpeg", None)
+
+        with self.assertRaises(RequestEntityTooLarge):
+            handler.receive_data_chunk(
+                b"\0" * (handler.max_bytes + 1), 0
+            )
+
+    @override_settings(BOOK_IMAGE_MAX_DIMENSION=100)
+    def test_upload_image_dimensions_too_large(self):
+        """Test images with too many pixels are rejected."""
+        res = self.upload_image(size=(200, 10))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", res.data)
+
+    def test_upload_image_unsupported_format(self):
+        """Test images in formats other than the allowed ones fail."""
+        res = self.upload_image(image_format="BMP")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", res.data)
+
+    def test_upload_file_not_image(self):
+        """Test files without an image header are rejected."""
+        url = image_upload_url(self.recipe.id)
+        payload = {"image": SimpleUploadedFile("cover.jpg", b"not an image")}
+
+        res = self.client.post(url, payload, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExportBookAPITests(TestCase):
+    """Tests for exporting books."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email="user@example.com",
+            password="userpass123"
+        )
+        self.client.force_authenticate(self.user)
+
+    def export(self, export_format=None):
+        """Export the books and return the response and its body."""
+        params = {"format": export_format} if export_format else {}
+        res = self.client.get(EXPORT_URL, params)
+        return res, b"".join(res.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        """Test books are exported as one JSON object per line."""
+        book = create_book(user=self.user, title="Dune")
+        book.genres.add(Genre.objects.create(name="Science Fiction"))
+        create_book(user=create_user(email="other@example.com"))
+
+        res, body = self.export()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("application/x-ndjson"))
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "Dune")
+        self.assertEqual(rows[0]["genres"][0]["name"], "Science Fiction")
+
+    def test_export_csv(self):
+        """Test books are exported as CSV with flattened names."""
+        book = create_book(user=self.user, title="Dune")
+        book.authors.add(
+            Author.objects.create(name="Frank Herbert"),
+            Author.objects.create(name="Brian Herbert"),
+        )
+
+        res, body = self.export("csv")
+
+        self.assertTrue(res["Content-Type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(rows[0]["title"], "Dune")
+        self.assertEqual(
+            sorted(rows[0]["authors"].split("|")),
+            ["Brian Herbert", "Frank Herbert"]
+        )
+
+    def test_export_single_query(self):
+        """Test books are exported through one server-side cursor."""
+        for i in range(5):
+            book = create_book(user=self.user, title=f"Book {i}")
+            book.genres.add(Genre.objects.create(name=f"Genre {i}"))
+
+        with patch.object(BookViewSet, "export_chunk_size", 2):
+            with CaptureQueriesContext(connection) as queries:
+                _, body = self.export()
+
+        self.assertEqual(len(body.splitlines()), 5)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("DECLARE", queries[0]["sql"])
+
+    async def test_export_async_stream(self):
+        """Test ASGI exports stream from an async iterator."""
+        await Book.objects.acreate(
+            user=self.user,
+            title="Dune",
+            price=Decimal("5.25"),
+            link="http://example.com/dune.pdf"
+        )
+        token = await Token.objects.acreate(user=self.user)
+
+        res = await self.async_client.get(
+            EXPORT_URL,
+            {"format": "csv"},
+            headers={"Authorization": f"Token {token.key}"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.is_async)
+        body = b"".join([chunk async for chunk in res.streaming_content])
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([row["title"] for row in rows], ["Dune"])
+
+    def test_export_unknown_format(self):
+        """Test unsupported export formats are not found."""
+        res = self.client.get(EXPORT_URL, {"format": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
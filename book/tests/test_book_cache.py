@@ -0,0 +1,276 @@
+"""
+Tests for book list caching and conditional requests
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import pre_delete
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.cache import STATS_KEYS, local_stats
+from book.models import Book
+from catalog.models import Genre
+
+BOOK_URL = reverse("book:book-list")
+BULK_URL = reverse("book:book-bulk")
+STATS_URL = reverse("book:book-cache-stats")
+
+
+def create_book(user, **params):
+    """Create and return a sample book."""
+    defaults = {
+        "title": "Sample book",
+        "price": "5.25",
+        "link": "http://example.com/book.pdf"
+    }
+    defaults.update(params)
+    return Book.objects.create(user=user, **defaults)
+
+
+class BookListCacheTests(TestCase):
+    """Test caching of the book list."""
+
+    def setUp(self):
+        cache.clear()
+        local_stats.take()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="test123"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_repeated_list_served_from_cache(self):
+        """Test an unchanged list is served without querying books."""
+        create_book(self.user)
+        first = self.client.get(BOOK_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(BOOK_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_query_params_cached_separately(self):
+        """Test different query strings get different cache entries."""
+        create_book(self.user, title="Dune")
+        create_book(self.user, title="Emma")
+
+        res = self.client.get(BOOK_URL)
+        paged = self.client.get(BOOK_URL, {"page_size": 1})
+
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertEqual(len(paged.data["results"]), 1)
+        self.assertNotEqual(res["ETag"], paged["ETag"])
+
+    def test_write_invalidates_cache(self):
+        """Test creating a book changes the cached list."""
+        first = self.client.get(BOOK_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                BOOK_URL,
+                {
+                    "title": "Dune",
+                    "price": "5.00",
+                    "link": "http://a.com/d.pdf"
+                }
+            )
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertNotEqual(res["ETag"], first["ETag"])
+
+    def test_bulk_write_invalidates_cache(self):
+        """Test bulk saving books changes the cached list."""
+        self.client.get(BOOK_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                BULK_URL,
+                [{
+                    "title": "Dune",
+                    "price": "5.00",
+                    "link": "http://a.com/d.pdf",
+                    "genres": [{"name": "Sf"}]
+                }],
+                format="json"
+            )
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_genre_rename_invalidates_cache(self):
+        """Test renaming a genre changes the cached list."""
+        book = create_book(self.user)
+        genre = Genre.objects.create(name="Fantasy")
+        book.genres.add(genre)
+        self.client.get(BOOK_URL)
+
+        genre.name = "Epic Fantasy"
+        with self.captureOnCommitCallbacks(execute=True):
+            genre.save()
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(
+            res.data["results"][0]["genres"][0]["name"], "Epic Fantasy"
+        )
+
+    def test_genre_delete_invalidates_reads_during_delete(self):
+        """Test a list read while a genre is deleted is not kept."""
+        book = create_book(self.user)
+        genre = Genre.objects.create(name="Fantasy")
+        book.genres.add(genre)
+        self.client.get(BOOK_URL)
+
+        def read_list(sender, **kwargs):
+            self.client.get(BOOK_URL)
+
+        pre_delete.connect(read_list, sender=Genre)
+        self.addCleanup(pre_delete.disconnect, read_list, sender=Genre)
+        with self.captureOnCommitCallbacks(execute=True):
+            genre.delete()
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res.data["results"][0]["genres"], [])
+
+    def test_other_user_write_keeps_cache(self):
+        """Test another user's writes do not invalidate the cache."""
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="test123"
+        )
+        first = self.client.get(BOOK_URL)
+
+        create_book(other)
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res["ETag"], first["ETag"])
+
+    def test_cache_stats_admin_only(self):
+        """Test the cache stats are limited to staff users."""
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cache_stats(self):
+        """Test the cache stats count hits and misses."""
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(BOOK_URL)
+        self.client.get(BOOK_URL)
+
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.data["hits"], 1)
+        self.assertEqual(res.data["misses"], 1)
+        self.assertEqual(res.data["hit_ratio"], 0.5)
+
+    def test_cache_stats_batched(self):
+        """Test hits and misses are reported once per interval."""
+        self.client.get(BOOK_URL)
+        self.client.get(BOOK_URL)
+        self.assertIsNone(cache.get(STATS_KEYS["misses"]))
+
+        later = time.monotonic() + 11
+        with patch("core.cache.time.monotonic", return_value=later):
+            self.client.get(BOOK_URL)
+
+        self.assertEqual(cache.get(STATS_KEYS["hits"]), 2)
+        self.assertEqual(cache.get(STATS_KEYS["misses"]), 1)
+
+
+class BookConditionalGetTests(TestCase):
+    """Test conditional GET requests for books."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="test123"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified(self):
+        """Test an unchanged list answers 304 without querying books."""
+        create_book(self.user)
+        res = self.client.get(BOOK_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_modified_in_same_second(self):
+        """Test a change right after a response is not answered with 304."""
+        res = self.client.get(BOOK_URL)
+        self.assertNotIn("Last-Modified", res)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_book(self.user)
+
+        res = self.client.get(
+            BOOK_URL, HTTP_IF_MODIFIED_SINCE=http_date(time.time())
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    @override_settings(BOOK_GENERATION_TIMEOUT=60)
+    def test_generation_expires(self):
+        """Test a change missed by a lost bump shows after expiry."""
+        book = create_book(self.user)
+        etag = self.client.get(BOOK_URL)["ETag"]
+        # Queryset updates send no signals, so the generation is not bumped.
+        Book.objects.filter(pk=book.pk).update(title="New title")
+
+        stale = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+        later = time.time() + 61
+        with patch("django.core.cache.backends.locmem.time.time",
+                   return_value=later):
+            res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(stale.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["title"], "New title")
+
+    def test_retrieve_modified(self):
+        """Test a changed book is sent again in full."""
+        book = create_book(self.user)
+        url = reverse("book:book-detail", args=[book.id])
+        etag = self.client.get(url)["ETag"]
+
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        book.title = "New title"
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["title"], "New title")
+
+    def test_updated_at_set_by_bulk_update(self):
+        """Test bulk updates stamp updated_at."""
+        book = create_book(self.user)
+
+        self.client.post(
+            BULK_URL,
+            [{
+                "id": book.id,
+                "title": "New title",
+                "price": "5.00",
+                "link": "http://a.com/d.pdf"
+            }],
+            format="json"
+        )
+
+        previous = book.updated_at
+        book.refresh_from_db()
+        self.assertGreater(book.updated_at, previous)
@@ -2,7 +2,9 @@
 Test for book filters
 """
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -67,9 +69,9 @@ class BookFilterTests(TestCase):
         serializer2 = BookSerializer(book2)
         serializer3 = BookSerializer(book3)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
 
     def test_filter_books_by_authors(self):
         """Test to filter a book by author"""
@@ -89,9 +91,9 @@ class BookFilterTests(TestCase):
         serializer2 = BookSerializer(book2)
         serializer3 = BookSerializer(book3)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
 
     def test_filter_books_by_genres_and_authors(self):
         """Test  to filter a book by genre and author"""
@@ -110,5 +112,161 @@ class BookFilterTests(TestCase):
         serializer1 = BookSerializer(book1)
         serializer2 = BookSerializer(book2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
+
+    def test_filter_books_ignores_case(self):
+        """Test filtering matches genre and author names in any case"""
+        genre = create_genre("Science Fiction")
+        author = create_author("Frank Herbert")
+
+        book1 = create_book(user=self.user, title="Dune")
+        book1.genres.add(genre)
+        book1.authors.add(author)
+
+        book2 = create_book(user=self.user, title="Other Book")
+
+        res = self.client.get(
+            BOOK_URL,
+            {"genres": "science fiction", "authors": " FRANK HERBERT"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        serializer1 = BookSerializer(book1)
+        serializer2 = BookSerializer(book2)
+
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
+
+    def test_filter_books_matching_several_genres_listed_once(self):
+        """Test a book matching several filter values is returned once"""
+        book = create_book(user=self.user, title="Book One")
+        book.genres.add(create_genre("Fantasy"), create_genre("History"))
+        book.authors.add(create_author("Author One"), create_author("Author Two"))
+
+        res = self.client.get(BOOK_URL, {
+            "genres": "Fantasy,History",
+            "authors": "Author One,Author Two",
+        })
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(res.data["results"], [BookSerializer(book).data])
+
+    def test_filter_books_matching_all_genres(self):
+        """Test match=all only returns books having every genre"""
+        fantasy = create_genre("Fantasy")
+        history = create_genre("History")
+        book1 = create_book(user=self.user, title="Book One")
+        book1.genres.add(fantasy, history)
+        book2 = create_book(user=self.user, title="Book Two")
+        book2.genres.add(fantasy)
+
+        res = self.client.get(
+            BOOK_URL, {"genres": "Fantasy,History", "match": "all"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(res.data["results"], [BookSerializer(book1).data])
+
+    def test_filter_books_matching_all_authors(self):
+        """Test match=all applies to authors as well"""
+        author1 = create_author("Author One")
+        author2 = create_author("Author Two")
+        book1 = create_book(user=self.user, title="Book One")
+        book1.authors.add(author1, author2)
+        book2 = create_book(user=self.user, title="Book Two")
+        book2.authors.add(author2)
+
+        res = self.client.get(
+            BOOK_URL, {"authors": "Author One,Author Two", "match": "all"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(res.data["results"], [BookSerializer(book1).data])
+
+    def test_filter_books_invalid_match(self):
+        """Test an unknown match mode is rejected"""
+        res = self.client.get(BOOK_URL, {"genres": "Fantasy", "match": "some"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_books(self):
+        """Test searching books by title and description"""
+        book1 = create_book(user=self.user, title="Dune")
+        book2 = create_book(
+            user=self.user,
+            title="Children of Dune",
+            description="The sequel set on the desert planet."
+        )
+        create_book(user=self.user, title="Neuromancer")
+
+        res = self.client.get(BOOK_URL, {"q": "desert planets"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [BookSerializer(book2).data])
+
+        res = self.client.get(BOOK_URL, {"q": "dune"})
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]],
+            [book2.id, book1.id]
+        )
+
+    def test_search_ranks_title_above_description(self):
+        """Test a title match ranks above a description match"""
+        title_match = create_book(user=self.user, title="Gardening basics")
+        create_book(user=self.user, title="Other book")
+        description_match = create_book(
+            user=self.user,
+            title="Cooking",
+            description="Includes a chapter on gardening."
+        )
+
+        res = self.client.get(BOOK_URL, {"q": "gardening"})
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]],
+            [title_match.id, description_match.id]
+        )
+
+    def test_search_paginates_by_rank(self):
+        """Test ranked search results can be paged through"""
+        books = [
+            create_book(user=self.user, title="Dune " * (i % 2 + 1))
+            for i in range(5)
+        ]
+
+        res = self.client.get(BOOK_URL, {"q": "dune", "page_size": 2})
+        ids = [book["id"] for book in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids.extend(book["id"] for book in res.data["results"])
+
+        self.assertEqual(ids, [
+            books[3].id, books[1].id, books[4].id, books[2].id, books[0].id
+        ])
+
+    def test_search_paginates_equal_ranks_without_offset(self):
+        """Test books of equal rank are paged by id instead of offset"""
+        books = [create_book(user=self.user, title="Dune") for _ in range(5)]
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(BOOK_URL, {"q": "dune", "page_size": 2})
+            ids = [book["id"] for book in res.data["results"]]
+            while res.data["next"]:
+                res = self.client.get(res.data["next"])
+                ids.extend(book["id"] for book in res.data["results"])
+
+        self.assertEqual(ids, [book.id for book in reversed(books)])
+        self.assertFalse(
+            any("OFFSET" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_search_with_genre_filter(self):
+        """Test searching only within the filtered genres"""
+        genre = create_genre("Science Fiction")
+        book1 = create_book(user=self.user, title="Dune")
+        book1.genres.add(genre)
+        create_book(user=self.user, title="Dune Cookbook")
+
+        res = self.client.get(
+            BOOK_URL, {"q": "dune", "genres": "Science Fiction"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [BookSerializer(book1).data])
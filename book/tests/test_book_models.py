@@ -1,15 +1,17 @@
 """
 Test for book models.
 """
+import hashlib
 import os
 from decimal import Decimal
-from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
 from book import models
 from book.models import book_image_file_path
+from catalog.models import Author, Genre
 
 
 def create_user(email="user@example.com", password="testpass123"):
@@ -37,12 +39,105 @@ class ModelTests(TestCase):
 
         self.assertEqual(str(book), book.title)
 
-    @patch("book.models.uuid.uuid4")
-    def test_book_image_file_path(self, mock_uuid):
-        """Test that image is saved in the correct location"""
-        uuid = "test-uuid"
-        mock_uuid.return_value = uuid
-        file_path = book_image_file_path(None, "example.jpg")
+    def test_book_image_file_path(self):
+        """Test that image is saved under the digest of its content"""
+        book = models.Book(
+            image=SimpleUploadedFile("example.JPG", b"image content")
+        )
+        file_path = book_image_file_path(book, "example.JPG")
 
-        expected_path = os.path.join("uploads", "book", f"{uuid}.jpg")
+        digest = hashlib.sha256(b"image content").hexdigest()
+        expected_path = os.path.join(
+            "uploads", "book", digest[:2], f"{digest}.jpg"
+        )
         self.assertEqual(file_path, expected_path)
+
+    def test_tag_snapshots_follow_changes(self):
+        """Test the genre and author snapshots track links and renames."""
+        book = models.Book.objects.create(
+            user=create_user(),
+            title="Book title",
+            price=Decimal("19.99"),
+            link="example_link.com"
+        )
+        fantasy = Genre.objects.create(name="Fantasy")
+        history = Genre.objects.create(name="History")
+
+        book.genres.add(fantasy, history)
+        self.assertEqual(
+            sorted(genre["name"] for genre in book.genres_snapshot),
+            ["Fantasy", "History"]
+        )
+
+        fantasy.name = "Epic Fantasy"
+        fantasy.save()
+        history.delete()
+        book.refresh_from_db()
+        self.assertEqual(
+            book.genres_snapshot, [{"id": fantasy.id, "name": "Epic Fantasy"}]
+        )
+
+        fantasy.book_set.clear()
+        book.refresh_from_db()
+        self.assertEqual(book.genres_snapshot, [])
+
+    def test_save_keeps_refreshed_snapshots(self):
+        """Test saving a loaded book does not restore an old snapshot."""
+        genre = Genre.objects.create(name="Fantasy")
+        book = models.Book.objects.create(
+            user=create_user(),
+            title="Book title",
+            price=Decimal("19.99"),
+            link="example_link.com"
+        )
+        book.genres.add(genre)
+        loaded = models.Book.objects.get(pk=book.pk)
+
+        genre.name = "Epic Fantasy"
+        genre.save()
+        loaded.title = "New title"
+        loaded.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.title, "New title")
+        self.assertEqual(
+            book.genres_snapshot, [{"id": genre.id, "name": "Epic Fantasy"}]
+        )
+
+    def test_save_keeps_generated_renditions(self):
+        """Test saving a loaded book does not drop new renditions."""
+        book = models.Book.objects.create(
+            user=create_user(),
+            title="Book title",
+            price=Decimal("19.99"),
+            link="example_link.com"
+        )
+        loaded = models.Book.objects.get(pk=book.pk)
+        renditions = {"thumbnail": {"jpg": "uploads/book/ab/ab.jpg"}}
+
+        models.Book.objects.filter(pk=book.pk).update(renditions=renditions)
+        loaded.title = "New title"
+        loaded.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.title, "New title")
+        self.assertEqual(book.renditions, renditions)
+
+    def test_refresh_snapshots(self):
+        """Test snapshots can be rebuilt from the link tables."""
+        book = models.Book.objects.create(
+            user=create_user(),
+            title="Book title",
+            price=Decimal("19.99"),
+            link="example_link.com"
+        )
+        author = Author.objects.create(name="Tolkien")
+        book.authors.through.objects.create(book=book, author=author)
+
+        models.Book.objects.refresh_snapshots()
+
+        book.refresh_from_db()
+        self.assertEqual(
+            book.authors_snapshot, [{"id": author.id, "name": "Tolkien"}]
+        )
+        self.assertEqual(book.genres_snapshot, [])
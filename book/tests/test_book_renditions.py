@@ -0,0 +1,204 @@
+"""
+Tests for book image storage and renditions
+"""
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book import renditions
+from book.models import Book
+
+BOOK_URL = reverse("book:book-list")
+
+
+def image_upload_url(book_id):
+    """Create and return an image upload URL."""
+    return reverse("book:book-upload-image", args=[book_id])
+
+
+def create_image(size=(800, 1200)):
+    """Create and return an uploadable JPEG image."""
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
+        Image.new("RGB", size, "red").save(image_file, format="JPEG")
+        image_file.seek(0)
+        return SimpleUploadedFile("cover.jpg", image_file.read())
+
+
+class RenditionTests(TestCase):
+    """Tests for storing images and generating their renditions."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            user=self.user,
+            title="Sample book",
+            price="5.25",
+            link="http://example.com/book.pdf",
+            image=create_image()
+        )
+
+    def test_generate_renditions(self):
+        """Test renditions are resized next to the original."""
+        result = renditions.generate_renditions(self.book.id)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.renditions, result)
+        self.assertEqual(set(result), set(renditions.SIZES))
+        thumbnail = result["thumbnail"]["webp"]
+        self.assertEqual(
+            thumbnail,
+            renditions.rendition_path(self.book.image.name, "thumbnail", "webp")
+        )
+        with default_storage.open(thumbnail) as image_file:
+            image = Image.open(image_file)
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, renditions.SIZES["thumbnail"])
+
+    def test_list_exposes_rendition_urls(self):
+        """Test listed books link to their renditions."""
+        renditions.generate_renditions(self.book.id)
+
+        res = self.client.get(BOOK_URL)
+
+        url = res.data["results"][0]["renditions"]["thumbnail"]["jpg"]
+        self.assertTrue(url.startswith("http://testserver/media/"))
+        self.assertTrue(url.endswith("_thumbnail.jpg"))
+
+    def test_rendition_urls_from_image_storage(self):
+        """Test rendition URLs come from the storage of the images."""
+        renditions.generate_renditions(self.book.id)
+        storage = Book._meta.get_field("image").storage
+
+        with patch.object(
+            storage, "url", side_effect=lambda name: f"/cdn/{name}"
+        ):
+            res = self.client.get(BOOK_URL)
+
+        url = res.data["results"][0]["renditions"]["medium"]["webp"]
+        self.assertTrue(url.startswith("http://testserver/cdn/"))
+
+    def test_upload_enqueues_renditions(self):
+        """Test uploads schedule renditions after the commit."""
+        executor = MagicMock()
+        with patch("book.renditions.get_executor", return_value=executor):
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(
+                    image_upload_url(self.book.id),
+                    {"image": create_image()},
+                    format="multipart"
+                )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        executor.submit.assert_called_once_with(
+            renditions.run_job, self.book.id
+        )
+
+    @override_settings(
+        BOOK_IMAGE_RENDITION_WORKERS=0, BOOK_IMAGE_ORPHAN_GRACE=0
+    )
+    def test_upload_replaces_renditions(self):
+        """Test a new upload removes the previous image and renditions."""
+        previous = self.book.image.name
+        thumbnail = renditions.generate_renditions(self.book.id)["thumbnail"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                image_upload_url(self.book.id),
+                {"image": create_image(size=(400, 600))},
+                format="multipart"
+            )
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.renditions, {})
+        self.assertNotEqual(self.book.image.name, previous)
+        self.assertFalse(default_storage.exists(previous))
+        self.assertFalse(default_storage.exists(thumbnail["webp"]))
+
+    def test_same_image_stored_once(self):
+        """Test books with identical images share one stored file."""
+        other = Book.objects.create(
+            user=self.user,
+            title="Other edition",
+            price="5.25",
+            link="http://example.com/book.pdf",
+            image=create_image()
+        )
+
+        self.assertEqual(other.image.name, self.book.image.name)
+        directory = os.path.dirname(self.book.image.name)
+        _, files = default_storage.listdir(directory)
+        self.assertEqual(files, [os.path.basename(self.book.image.name)])
+
+    @override_settings(BOOK_IMAGE_ORPHAN_GRACE=0)
+    def test_delete_book_releases_unshared_image(self):
+        """Test deleting the last book using an image deletes the file."""
+        other = Book.objects.create(
+            user=self.user,
+            title="Other edition",
+            price="5.25",
+            link="http://example.com/book.pdf",
+            image=create_image()
+        )
+        name = self.book.image.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        self.assertTrue(default_storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.delete()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_release_keeps_recent_images(self):
+        """Test orphans within the grace period are kept."""
+        name = self.book.image.name
+        Book.objects.filter(pk=self.book.pk).update(image=None)
+
+        self.assertEqual(renditions.release_images(name), [])
+        self.assertEqual(renditions.release_images(name, grace=0), [name])
+
+    def test_cleanup_images_command(self):
+        """Test the cleanup command deletes orphans only."""
+        orphan = Book.objects.create(
+            user=self.user,
+            title="Other edition",
+            price="5.25",
+            link="http://example.com/book.pdf",
+            image=create_image(size=(400, 600))
+        )
+        name = orphan.image.name
+        Book.objects.filter(pk=orphan.pk).update(image=None)
+
+        call_command("cleanup_images", "--grace=0", stdout=MagicMock())
+
+        self.assertFalse(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(self.book.image.name))
+
+    def test_process_renditions_command(self):
+        """Test the worker command renders pending books."""
+        call_command("process_renditions", "--once", stdout=MagicMock())
+
+        self.book.refresh_from_db()
+        self.assertIn("medium", self.book.renditions)
+        self.assertFalse(renditions.pending_books().exists())
@@ -0,0 +1,159 @@
+"""
+Tests for the import_books command
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from book import importer
+from book.models import Book
+from catalog.models import Genre
+
+CSV_HEADER = "title,description,price,link,genres,authors\n"
+
+
+class ImportBooksMixin:
+    """Helpers to write import files and run the command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="testpass123"
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_file(self, name, content):
+        """Write an import file and return its path."""
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def write_ndjson(self, records):
+        """Write records to an NDJSON file and return its path."""
+        return self.write_file(
+            "books.ndjson",
+            "".join(json.dumps(record) + "\n" for record in records)
+        )
+
+    def import_books(self, path, *args):
+        """Run the import and return its output."""
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_books", path, "--user", self.user.email, *args,
+            stdout=stdout, stderr=stderr
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+
+def book_record(index, **params):
+    """Return an NDJSON book record."""
+    record = {
+        "title": f"Book {index}",
+        "price": "9.99",
+        "link": f"http://example.com/{index}.pdf",
+        "genres": ["Fantasy"],
+        "authors": [{"name": f"Author {index % 3}"}],
+    }
+    record.update(params)
+    return record
+
+
+class ImportBooksTests(ImportBooksMixin, TestCase):
+    """Tests for importing books."""
+
+    def test_import_csv(self):
+        """Test books and their names are imported from CSV."""
+        path = self.write_file(
+            "books.csv",
+            CSV_HEADER
+            + "Dune,A desert planet,9.99,http://a.com/d.pdf,"
+            "science fiction|Classic,Frank Herbert\n"
+        )
+
+        self.import_books(path)
+
+        book = Book.objects.get(user=self.user)
+        self.assertEqual(book.title, "Dune")
+        self.assertEqual(
+            sorted(book.genres.values_list("name", flat=True)),
+            ["Classic", "Science Fiction"]
+        )
+        self.assertEqual(book.authors.get().name, "Frank Herbert")
+
+    def test_import_ndjson_in_chunks(self):
+        """Test names are shared across chunks."""
+        Genre.objects.create(name="Fantasy")
+        path = self.write_ndjson([book_record(i) for i in range(7)])
+
+        stdout, _ = self.import_books(path, "--chunk-size", "3")
+
+        self.assertEqual(Book.objects.filter(user=self.user).count(), 7)
+        self.assertEqual(Genre.objects.count(), 1)
+        self.assertIn("7 books imported", stdout)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def test_invalid_records_skipped(self):
+        """Test invalid records are reported without stopping the import."""
+        path = self.write_file(
+            "books.ndjson",
+            json.dumps(book_record(1)) + "\n"
+            + json.dumps(book_record(2, price="free")) + "\n"
+            + "{not json\n"
+            + json.dumps(book_record(3)) + "\n"
+        )
+
+        stdout, stderr = self.import_books(path)
+
+        self.assertEqual(Book.objects.filter(user=self.user).count(), 2)
+        self.assertIn("Record 2:", stderr)
+        self.assertIn("Record 3:", stderr)
+        self.assertIn("skipped 2 invalid records", stdout)
+
+    def test_resume_from_checkpoint(self):
+        """Test --resume skips the records of the previous run."""
+        path = self.write_ndjson([book_record(i) for i in range(5)])
+        importer.write_checkpoint(f"{path}.checkpoint", 3)
+
+        self.import_books(path, "--resume")
+
+        self.assertEqual(
+            sorted(Book.objects.values_list("title", flat=True)),
+            ["Book 3", "Book 4"]
+        )
+
+    def test_checkpoint_written_per_chunk(self):
+        """Test the checkpoint follows the committed chunks."""
+        path = self.write_ndjson([book_record(i) for i in range(5)])
+        checkpoint = os.path.join(self.directory, "checkpoint")
+
+        with open(path) as file:
+            results = importer.import_books(
+                file, "ndjson", self.user, chunk_size=2,
+                checkpoint=checkpoint
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                next(results)
+
+        self.assertEqual(importer.read_checkpoint(checkpoint), 2)
+
+
+class ImportBooksWorkersTests(ImportBooksMixin, TransactionTestCase):
+    """Tests for validating imports in worker processes."""
+
+    def test_import_with_workers(self):
+        """Test records are imported in order with worker processes."""
+        path = self.write_ndjson([book_record(i) for i in range(10)])
+
+        self.import_books(path, "--chunk-size", "2", "--workers", "2")
+
+        self.assertEqual(
+            list(Book.objects.order_by("id").values_list("title", flat=True)),
+            [f"Book {i}" for i in range(10)]
+        )
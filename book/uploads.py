@@ -0,0 +1,106 @@
+"""
+Upload handling for book images.
+"""
+import hashlib
+import io
+
+from PIL import Image, UnidentifiedImageError
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from rest_framework import exceptions, status
+
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+# Largest prefix of a file buffered while looking for the image header.
+MAX_HEADER_BYTES = 256 * 1024
+# Room for the multipart boundaries and headers around the image.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class RequestEntityTooLarge(exceptions.APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Request body is too large."
+    default_code = "request_entity_too_large"
+
+
+class BoundedImageUploadHandler(TemporaryFileUploadHandler):
+    """Stream an image upload to disk, rejecting it as early as possible.
+
+    Requests whose Content-Length is already too big are refused before
+    the body is read. Otherwise chunks go straight to a temporary file
+    while the byte count is enforced, and the image header is parsed from
+    the first chunks to check the format and pixel dimensions without
+    decoding the image. The content is hashed on the way for the
+    content-addressed image storage.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_bytes = settings.BOOK_IMAGE_MAX_BYTES
+        self.max_dimension = settings.BOOK_IMAGE_MAX_DIMENSION
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        if content_length > self.max_bytes + MULTIPART_OVERHEAD:
+            raise self.too_large()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.header = bytearray()
+        self.header_checked = False
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_bytes:
+            self.file.close()
+            raise self.too_large()
+
+        if not self.header_checked:
+            self.header += raw_data
+            self.check_header(final=False)
+
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not self.header_checked:
+            self.check_header(final=True)
+
+        file = super().file_complete(file_size)
+        file.content_digest = self.hasher.hexdigest()
+        return file
+
+    def check_header(self, final):
+        """Validate the image header once enough of it has arrived."""
+        try:
+            image = Image.open(io.BytesIO(self.header))
+        except Image.DecompressionBombError:
+            self.reject("Image dimensions are too large.")
+        except (UnidentifiedImageError, OSError, SyntaxError):
+            # Not recognized yet, or the header runs past the bytes so far
+            # (e.g. behind large EXIF/ICC segments): wait for more.
+            if final or len(self.header) >= MAX_HEADER_BYTES:
+                self.reject("Upload a valid image.")
+            return
+
+        self.header_checked = True
+        self.header = bytearray()
+        if image.format not in ALLOWED_FORMATS:
+            self.reject(
+                f"Unsupported image format, use one of "
+                f"{', '.join(sorted(ALLOWED_FORMATS))}."
+            )
+        if max(image.size) > self.max_dimension:
+            self.reject(
+                f"Image dimensions may not exceed "
+                f"{self.max_dimension}x{self.max_dimension} pixels."
+            )
+
+    def too_large(self):
+        return RequestEntityTooLarge(
+            f"Image may not be larger than {self.max_bytes} bytes."
+        )
+
+    def reject(self, message):
+        """Abort the upload with a validation error for the image."""
+        self.file.close()
+        raise exceptions.ValidationError({"image": [message]})
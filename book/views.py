@@ -1,6 +1,9 @@
 """
 Views for the Book APIs
 """
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -8,19 +11,34 @@ from rest_framework import status
 from rest_framework import (
     viewsets,
 )
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from book import serializers
+from book import cache, renditions, serializers
 from book.filters import BookFilter
 from book.models import Book
+from book.pagination import BookCursorPagination
+from book.uploads import BoundedImageUploadHandler
+from core.conditional import (
+    conditional_response,
+    make_etag,
+    set_validators
+)
+from core.renderers import CSVRenderer, NDJSONRenderer
+from core.views import AsyncViewSetMixin
+from user.authentication import SignedTokenAuthentication
 
 
 @extend_schema(
     tags=["Book"],
     parameters=[
+        OpenApiParameter(
+            "q",
+            OpenApiTypes.STR,
+            description="Full-text search on title and description, "
+                        "results are ordered by relevance",
+        ),
         OpenApiParameter(
             "genres",
             OpenApiTypes.STR,
@@ -30,18 +48,29 @@ from book.models import Book
             "authors",
             OpenApiTypes.STR,
             description="Comma-separated list of author names to filter",
+        ),
+        OpenApiParameter(
+            "match",
+            OpenApiTypes.STR,
+            enum=["any", "all"],
+            description="Whether books need any (default) or all of the "
+                        "given genres and authors",
         )
     ]
 )
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(AsyncViewSetMixin, viewsets.ModelViewSet):
     """View for manage book Api"""
 
+    # Listing and retrieving books are async; writes stay synchronous.
+
     serializer_class = serializers.BookDetailSerializer
     queryset = Book.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = BookFilter
+    pagination_class = BookCursorPagination
+    export_chunk_size = 2000
 
     def get_serializer_class(self):
         """Return the serializer class for requests."""
@@ -51,21 +80,167 @@ class BookViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def get_queryset(self):
-        """Retrieve books for authenticated users, filtered by user, distinct."""
-        return self.queryset.filter(user=self.request.user).order_by("-id").distinct()
+        """Retrieve books for authenticated users, filtered by user."""
+        return self.queryset.filter(user=self.request.user).order_by("-id")
+
+    def get_validators(self, request, generation):
+        """Return the cache key and ETag of a response.
+
+        No Last-Modified is sent: with whole seconds, a change in the same
+        second as the previous response would still be answered with 304.
+        """
+        cache_key = cache.book_cache_key(request, generation)
+        return cache_key, make_etag(cache_key)
+
+    async def list(self, request, *args, **kwargs):
+        """List books, served from the per-user cache while unchanged."""
+        generation = await cache.aget_book_generation(request.user.pk)
+        cache_key, etag = self.get_validators(request, generation)
+        response = conditional_response(request, etag)
+        if response is not None:
+            return response
+
+        data = await cache.aget_cached_book_list(cache_key)
+        if data is None:
+            response = await self.list_rows(request)
+            await cache.aset_cached_book_list(cache_key, response.data)
+        else:
+            response = Response(data)
+
+        return set_validators(response, etag)
+
+    async def list_rows(self, request):
+        """Return a page of books rendered by the fast read serializer."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(
+            serializers.BookListReadSerializer.get_rows(queryset),
+            request,
+            view=self
+        )
+        serializer = serializers.BookListReadSerializer(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return self.get_paginated_response(serializer.data)
+
+    async def retrieve(self, request, *args, **kwargs):
+        """Retrieve a book, answering 304 while it is unchanged."""
+        generation = await cache.aget_book_generation(request.user.pk)
+        _, etag = self.get_validators(request, generation)
+        response = conditional_response(request, etag)
+        if response is not None:
+            return response
+
+        book = await self.aget_object()
+        response = Response(self.get_serializer(book).data)
+        return set_validators(response, etag)
+
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="cache-stats",
+        permission_classes=[IsAdminUser]
+    )
+    def cache_stats(self, request):
+        """Return hit/miss counts of the book list cache."""
+        return Response(cache.get_cache_stats())
 
     def perform_create(self, serializer):
         """Save a new book for the authenticated user."""
         serializer.save(user=self.request.user)
 
+    @extend_schema(
+        request=serializers.BookDetailSerializer(many=True),
+        responses={201: serializers.BookDetailSerializer(many=True)}
+    )
+    @action(methods=["POST"], detail=False, url_path="bulk")
+    def bulk(self, request):
+        """Create or update many books in a single transaction."""
+        serializer = self.get_serializer(
+            self.get_queryset(), data=request.data, many=True
+        )
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            books = serializer.save(user=request.user)
+        cache.bump_book_generation(request.user.pk)
+
+        saved = self.get_queryset().in_bulk([book.id for book in books])
+        output = self.get_serializer(
+            [saved[book.id] for book in books], many=True
+        )
+        return Response(output.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "format",
+                OpenApiTypes.STR,
+                enum=["ndjson", "csv"],
+                description="Export format (default ndjson)",
+            )
+        ],
+        responses={
+            (200, NDJSONRenderer.media_type): OpenApiTypes.STR,
+            (200, CSVRenderer.media_type): OpenApiTypes.STR,
+        }
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+        renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export(self, request):
+        """Stream all books of the user as NDJSON or CSV.
+
+        ASGI serves streams from async iterators without buffering them,
+        WSGI from sync ones, so the rows are read to match the handler.
+        """
+        renderer = request.accepted_renderer
+        if isinstance(request._request, ASGIRequest):
+            stream = renderer.arender_stream(self.aexport_rows())
+        else:
+            stream = renderer.render_stream(self.export_rows())
+        response = StreamingHttpResponse(
+            stream,
+            content_type=f"{renderer.media_type}; charset={renderer.charset}"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="books.{renderer.format}"'
+        )
+        return response
+
+    def export_rows(self):
+        """Yield the serialized books, read from the database in chunks."""
+        serializer = self.get_serializer()
+        queryset = self.get_queryset()
+        for book in queryset.iterator(chunk_size=self.export_chunk_size):
+            yield serializer.to_representation(book)
+
+    async def aexport_rows(self):
+        """Async counterpart of ``export_rows()``."""
+        serializer = self.get_serializer()
+        queryset = self.get_queryset()
+        async for book in queryset.aiterator(
+            chunk_size=self.export_chunk_size
+        ):
+            yield serializer.to_representation(book)
+
     @action(methods=["POST"], detail=True, url_path="upload-image")
     def upload_image(self, request, pk=None):
         """Upload an image to a book"""
+        # Parsers take the handlers from the DRF request, so this has to
+        # be set before request.data is first accessed.
+        request.upload_handlers = [BoundedImageUploadHandler(request)]
         book = self.get_object()
         serializer = serializers.BookImageSerializer(book, data=request.data)
 
         if serializer.is_valid():
+            previous = book.image.name
             serializer.save()
+            transaction.on_commit(
+                lambda: renditions.release_images(previous)
+            )
+            renditions.enqueue_renditions(book)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
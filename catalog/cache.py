@@ -0,0 +1,39 @@
+"""
+Versions of the genre and author lists.
+
+Each catalog model has a version, a timestamp stored in the cache that is
+bumped once a change to any of its entries is committed. List responses
+use it in their ETag, so a client's copy is validated without a query.
+Versions expire after CATALOG_VERSION_TIMEOUT seconds, so a bump that was
+lost does not leave stale responses forever.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(model):
+    """Return the cache key of a catalog model's version."""
+    return f"catalog-version:{model._meta.label_lower}"
+
+
+async def aget_catalog_version(model):
+    """Return the current version of a catalog model's entries."""
+    key = version_key(model)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(
+            key, time.time_ns(), settings.CATALOG_VERSION_TIMEOUT
+        )
+        version = await cache.aget(key)
+    return version
+
+
+def bump_catalog_version(model):
+    """Invalidate the lists of a catalog model once the changes commit."""
+    key = version_key(model)
+    transaction.on_commit(lambda: cache.set(
+        key, time.time_ns(), settings.CATALOG_VERSION_TIMEOUT
+    ))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:06
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def merge_duplicate_names(apps, schema_editor):
+    """Merge catalog rows whose names only differ in case into the oldest."""
+    Book = apps.get_model("book", "Book")
+
+    for model_name, field_name in (("Genre", "genres"), ("Author", "authors")):
+        model = apps.get_model("catalog", model_name)
+        through = Book._meta.get_field(field_name).remote_field.through
+        tag_column = f"{model_name.lower()}_id"
+
+        keepers = {}
+        for obj in model.objects.annotate(
+            name_lower=Lower("name")
+        ).order_by("id"):
+            keeper = keepers.setdefault(obj.name_lower, obj)
+            if keeper.id == obj.id:
+                continue
+
+            linked = through.objects.filter(**{tag_column: keeper.id})
+            through.objects.filter(**{tag_column: obj.id}).exclude(
+                book_id__in=linked.values("book_id")
+            ).update(**{tag_column: keeper.id})
+            obj.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book', '0006_book_user_id_idx'),
+        ('catalog', '0003_author'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:06
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_merge_duplicate_names'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='author',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='catalog_author_name_ci_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='genre',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='catalog_genre_name_ci_unique'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+TABLES = ("catalog_genre", "catalog_author")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Index names for trigram search where pg_trgm can be installed.
+
+    The indexes are optional: without the extension the suggest endpoints
+    fall back to ranking candidates in Python.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone() is None:
+            return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in TABLES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_name_trgm_idx "
+            f"ON {table} USING gin (name gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table in TABLES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_name_ci_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['-name', '-id'], name='catalog_author_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['-name', '-id'], name='catalog_genre_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 09:07
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='author',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='genre',
+            name='updated_at',
+        ),
+    ]
@@ -2,12 +2,79 @@
 Catalog database models.
 """
 from django.db import models
+from django.db.models.functions import Lower
+
+from catalog.cache import bump_catalog_version
+
+
+def normalize_name(name):
+    """Return the canonical form of a catalog name."""
+    return name.strip().title()
+
+
+class CatalogManager(models.Manager):
+    """Manager for catalog objects identified by their name."""
+
+    def filter_names(self, names):
+        """Return objects matching any of the names, ignoring case."""
+        return self.annotate(name_lower=Lower("name")).filter(
+            name_lower__in={name.lower() for name in names}
+        )
+
+    def resolve_names(self, names):
+        """Return normalized names mapped to objects, creating missing ones.
+
+        Missing names are inserted with ``ON CONFLICT DO NOTHING`` and read
+        back, so concurrent writers end up sharing the same rows.
+        """
+        lookup = {
+            normalize_name(name).lower(): normalize_name(name)
+            for name in names
+        }
+        if not lookup:
+            return {}
+
+        objects = {
+            lookup[obj.name_lower]: obj
+            for obj in self.filter_names(lookup)
+        }
+
+        missing = [name for name in lookup.values() if name not in objects]
+        if missing:
+            self.bulk_create(
+                [self.model(name=name) for name in missing],
+                ignore_conflicts=True
+            )
+            # bulk_create() sends no post_save.
+            bump_catalog_version(self.model)
+            objects.update(
+                (lookup[obj.name_lower], obj)
+                for obj in self.filter_names(missing)
+            )
+
+        return objects
 
 
 class Genre(models.Model):
     """Genre object"""
     name = models.CharField(max_length=255)
 
+    objects = CatalogManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower("name"),
+                name="catalog_genre_name_ci_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["-name", "-id"],
+                name="catalog_genre_name_id_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -16,5 +83,21 @@ class Author(models.Model):
     """Author object"""
     name = models.CharField(max_length=255)
 
+    objects = CatalogManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower("name"),
+                name="catalog_author_name_ci_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["-name", "-id"],
+                name="catalog_author_name_id_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
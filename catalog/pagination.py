@@ -0,0 +1,12 @@
+"""
+Pagination for the catalog APIs.
+"""
+from core.pagination import AsyncCursorPagination
+
+
+class CatalogCursorPagination(AsyncCursorPagination):
+    """Keyset pagination over catalog entries by name, Z to A."""
+    ordering = ("-name", "-id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
@@ -0,0 +1,73 @@
+"""
+Name suggestions for catalog type-ahead.
+"""
+import re
+from functools import lru_cache
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+
+# Same default as pg_trgm's ``pg_trgm.similarity_threshold``.
+SIMILARITY_THRESHOLD = 0.3
+# Rows ranked in Python when pg_trgm is not installed.
+FALLBACK_CANDIDATES = 1000
+
+
+@lru_cache
+def has_trigram_extension(alias):
+    """Return whether the pg_trgm extension is installed on a database."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def trigrams(text):
+    """Return the trigrams of a text the way pg_trgm extracts them."""
+    result = set()
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(a, b):
+    """Return the pg_trgm similarity of two texts, between 0 and 1."""
+    a, b = trigrams(a), trigrams(b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def suggest(queryset, prefix, limit):
+    """Return up to limit objects whose name best matches the prefix.
+
+    With pg_trgm installed, names are matched by trigram word similarity
+    through the GIN index. Otherwise a bounded set of candidates sharing
+    the first characters is ranked in Python, prefix matches first.
+    """
+    if has_trigram_extension(queryset.db):
+        return list(
+            queryset.annotate(
+                similarity=TrigramWordSimilarity(prefix, "name")
+            ).filter(
+                name__trigram_word_similar=prefix
+            ).order_by("-similarity", "name")[:limit]
+        )
+
+    candidates = queryset.filter(
+        name__icontains=prefix[:3]
+    ).order_by("name")[:FALLBACK_CANDIDATES]
+
+    ranked = []
+    for obj in candidates:
+        is_prefix = obj.name.lower().startswith(prefix.lower())
+        similarity = trigram_similarity(obj.name, prefix)
+        if is_prefix or similarity >= SIMILARITY_THRESHOLD:
+            ranked.append((not is_prefix, -similarity, obj.name, obj))
+
+    ranked.sort(key=lambda item: item[:3])
+    return [obj for *_, obj in ranked[:limit]]
@@ -7,7 +7,18 @@ from rest_framework import serializers
 from catalog.models import Genre, Author
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class CatalogSerializer(serializers.ModelSerializer):
+    """Serializer that can be limited to a subset of its fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class GenreSerializer(CatalogSerializer):
     """Serializer for Genres."""
 
     class Meta:
@@ -16,7 +27,7 @@ class GenreSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(CatalogSerializer):
     """Serializer for Authors."""
 
     class Meta:
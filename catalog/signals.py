@@ -0,0 +1,16 @@
+"""
+Signal handlers invalidating the genre and author lists.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from catalog.cache import bump_catalog_version
+from catalog.models import Genre, Author
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Author)
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version(sender)
@@ -11,6 +11,7 @@ from catalog.models import Author
 from catalog.serializers import AuthorSerializer
 
 AUTHOR_URL = reverse("catalog:author-list")
+SUGGEST_URL = reverse("catalog:author-suggest")
 
 
 def detail_url(author_id):
@@ -62,7 +63,38 @@ class PrivateAuthorApiTests(TestCase):
 
         authors = Author.objects.all().order_by("-name")
         serializer = AuthorSerializer(authors, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_list_authors_is_paginated(self):
+        """Test authors are listed in pages ordered by name."""
+        authors = [create_author(name=f"Name {i}") for i in range(5)]
+
+        res = self.client.get(AUTHOR_URL, {"page_size": 3})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [author["id"] for author in res.data["results"]],
+            [authors[4].id, authors[3].id, authors[2].id]
+        )
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [author["id"] for author in res.data["results"]],
+            [authors[1].id, authors[0].id]
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_list_authors_sparse_fields(self):
+        """Test listing only the ids of authors."""
+        author = create_author(name="Author_one")
+
+        res = self.client.get(AUTHOR_URL, {"fields": "id"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [{"id": author.id}])
+
+    def test_list_authors_unknown_field_error(self):
+        """Test requesting an unknown field gives an error."""
+        res = self.client.get(AUTHOR_URL, {"fields": "id,secret"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_update_author(self):
         """Test for updating an author"""
@@ -78,6 +110,21 @@ class PrivateAuthorApiTests(TestCase):
         author.refresh_from_db()
         self.assertEqual(author.name, payload["name"])
 
+    def test_update_author_to_existing_name_error(self):
+        """Test renaming a author to an existing name gives an error."""
+        create_author(name="Author_two")
+        author = create_author(name="Author_one")
+        payload = {
+            "name": "author_two"
+        }
+        url = detail_url(author.id)
+
+        res = self.client.patch(url, payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        author.refresh_from_db()
+        self.assertEqual(author.name, "Author_one")
+
     def test_delete_author(self):
         author = create_author(name="Author_one")
 
@@ -86,3 +133,37 @@ class PrivateAuthorApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
 
         self.assertFalse(Author.objects.filter(id=author.id).exists())
+
+    def test_suggest_authors(self):
+        """Test suggesting authors matching a prefix."""
+        for name in ["Tolkien", "Tolstoy", "Terry Pratchett"]:
+            create_author(name=name)
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "tol"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [author["name"] for author in res.data],
+            ["Tolkien", "Tolstoy"]
+        )
+
+    def test_suggest_authors_limit(self):
+        """Test the number of suggested authors can be limited."""
+        for name in ["Tolkien", "Tolstoy", "Terry Pratchett"]:
+            create_author(name=name)
+
+        res = self.client.get(
+            SUGGEST_URL, {"prefix": "tol", "limit": 1}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [author["name"] for author in res.data],
+            ["Tolkien"]
+        )
+
+    def test_suggest_authors_without_prefix(self):
+        """Test no authors are suggested without a prefix."""
+        create_author(name="Tolkien")
+
+        res = self.client.get(SUGGEST_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [])
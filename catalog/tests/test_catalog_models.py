@@ -2,6 +2,7 @@
 Test for catalog models.
 """
 
+from django.db import IntegrityError
 from django.test import TestCase
 
 from catalog import models
@@ -27,3 +28,31 @@ class ModelTest(TestCase):
         )
 
         self.assertEqual(str(author), author.name)
+
+    def test_genre_name_unique_ignoring_case(self):
+        """Test genre names are unique regardless of case."""
+        models.Genre.objects.create(name="Fantasy")
+
+        with self.assertRaises(IntegrityError):
+            models.Genre.objects.create(name="fantasy")
+
+    def test_author_name_unique_ignoring_case(self):
+        """Test author names are unique regardless of case."""
+        models.Author.objects.create(name="Author One")
+
+        with self.assertRaises(IntegrityError):
+            models.Author.objects.create(name="AUTHOR ONE")
+
+    def test_resolve_names(self):
+        """Test resolving names reuses existing entries and creates others."""
+        existing = models.Genre.objects.create(name="science fiction")
+
+        genres = models.Genre.objects.resolve_names(
+            ["Science Fiction ", "history", "HISTORY"]
+        )
+
+        self.assertEqual(set(genres), {"Science Fiction", "History"})
+        self.assertEqual(genres["Science Fiction"], existing)
+        self.assertEqual(genres["History"].name, "History")
+        self.assertIsNotNone(genres["History"].id)
+        self.assertEqual(models.Genre.objects.count(), 2)
@@ -0,0 +1,58 @@
+"""
+Tests for catalog name suggestions.
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from catalog import search
+from catalog.models import Author
+
+
+class TrigramSimilarityTests(TestCase):
+    """Test the Python trigram similarity."""
+
+    def test_trigrams(self):
+        """Test trigrams are extracted per padded, lower-cased word."""
+        self.assertEqual(
+            search.trigrams("Cat_Dog"),
+            {"  c", " ca", "cat", "at ", "  d", " do", "dog", "og "}
+        )
+
+    def test_trigram_similarity(self):
+        """Test similarity is shared trigrams over all trigrams."""
+        self.assertEqual(search.trigram_similarity("Tolkien", "tolkien"), 1)
+        self.assertEqual(search.trigram_similarity("Tolkien", "xyz"), 0)
+        self.assertAlmostEqual(
+            search.trigram_similarity("Tolkien", "tol"), 3 / 9
+        )
+
+    def test_trigram_similarity_empty(self):
+        """Test texts without words are not similar to anything."""
+        self.assertEqual(search.trigram_similarity("", "tol"), 0)
+
+
+@patch("catalog.search.has_trigram_extension", return_value=False)
+class FallbackSuggestTests(TestCase):
+    """Test suggestions ranked in Python without pg_trgm."""
+
+    def setUp(self):
+        for name in ["Tolstoy", "Tolkien", "Terry Pratchett", "Atoll"]:
+            Author.objects.create(name=name)
+
+    def suggest(self, prefix, limit=10):
+        """Return the suggested author names."""
+        authors = search.suggest(Author.objects.all(), prefix, limit)
+        return [author.name for author in authors]
+
+    def test_suggest_prefix_matches_first(self, mock_extension):
+        """Test names are matched by prefix, not anywhere in the name."""
+        self.assertEqual(self.suggest("tol"), ["Tolkien", "Tolstoy"])
+
+    def test_suggest_tolerates_typos(self, mock_extension):
+        """Test similar names are suggested despite a typo."""
+        self.assertEqual(self.suggest("tolkein"), ["Tolkien"])
+
+    def test_suggest_limit(self, mock_extension):
+        """Test no more than limit suggestions are returned."""
+        self.assertEqual(self.suggest("tol", limit=1), ["Tolkien"])
@@ -11,6 +11,7 @@ from catalog.models import Genre
 from catalog.serializers import GenreSerializer
 
 GENRE_URL = reverse("catalog:genre-list")
+SUGGEST_URL = reverse("catalog:genre-suggest")
 
 
 def detail_url(genre_id):
@@ -62,7 +63,38 @@ class PrivateGenreApiTests(TestCase):
 
         genres = Genre.objects.all().order_by("-name")
         serializer = GenreSerializer(genres, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_list_genres_is_paginated(self):
+        """Test genres are listed in pages ordered by name."""
+        genres = [create_genre(name=f"Name {i}") for i in range(5)]
+
+        res = self.client.get(GENRE_URL, {"page_size": 3})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [genre["id"] for genre in res.data["results"]],
+            [genres[4].id, genres[3].id, genres[2].id]
+        )
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [genre["id"] for genre in res.data["results"]],
+            [genres[1].id, genres[0].id]
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_list_genres_sparse_fields(self):
+        """Test listing only the ids of genres."""
+        genre = create_genre(name="Fantasy")
+
+        res = self.client.get(GENRE_URL, {"fields": "id"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [{"id": genre.id}])
+
+    def test_list_genres_unknown_field_error(self):
+        """Test requesting an unknown field gives an error."""
+        res = self.client.get(GENRE_URL, {"fields": "id,secret"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_update_genre(self):
         """Test for updating a genre"""
@@ -78,6 +110,21 @@ class PrivateGenreApiTests(TestCase):
         genre.refresh_from_db()
         self.assertEqual(genre.name, payload["name"])
 
+    def test_update_genre_to_existing_name_error(self):
+        """Test renaming a genre to an existing name gives an error."""
+        create_genre(name="History")
+        genre = create_genre(name="Fantasy")
+        payload = {
+            "name": "history"
+        }
+        url = detail_url(genre.id)
+
+        res = self.client.patch(url, payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        genre.refresh_from_db()
+        self.assertEqual(genre.name, "Fantasy")
+
     def test_delete_genre(self):
         genre = create_genre(name="Fantasy")
 
@@ -86,3 +133,77 @@ class PrivateGenreApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
 
         self.assertFalse(Genre.objects.filter(id=genre.id).exists())
+
+    def test_suggest_genres(self):
+        """Test suggesting genres matching a prefix."""
+        for name in ["Fantasy", "Fairy Tale", "History"]:
+            create_genre(name=name)
+
+        res = self.client.get(SUGGEST_URL, {"prefix": "fan"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [genre["name"] for genre in res.data],
+            ["Fantasy"]
+        )
+
+    def test_suggest_genres_limit(self):
+        """Test the number of suggested genres can be limited."""
+        for name in ["Fantasy", "Fairy Tale", "History"]:
+            create_genre(name=name)
+
+        res = self.client.get(
+            SUGGEST_URL, {"prefix": "fan", "limit": 1}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [genre["name"] for genre in res.data],
+            ["Fantasy"]
+        )
+
+    def test_suggest_genres_without_prefix(self):
+        """Test no genres are suggested without a prefix."""
+        create_genre(name="Fantasy")
+
+        res = self.client.get(SUGGEST_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [])
+
+    def test_list_genres_not_modified(self):
+        """Test an unchanged genre list answers 304 to its ETag."""
+        create_genre(name="Fantasy")
+        res = self.client.get(GENRE_URL)
+        self.assertNotIn("Last-Modified", res)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(GENRE_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_genres_modified(self):
+        """Test renaming or deleting a genre changes the ETag."""
+        genre = create_genre(name="Fantasy")
+        other = create_genre(name="History")
+        first = self.client.get(GENRE_URL)["ETag"]
+
+        genre.name = "Epic Fantasy"
+        with self.captureOnCommitCallbacks(execute=True):
+            genre.save()
+        renamed = self.client.get(GENRE_URL, HTTP_IF_NONE_MATCH=first)
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        deleted = self.client.get(
+            GENRE_URL, HTTP_IF_NONE_MATCH=renamed["ETag"]
+        )
+
+        self.assertEqual(renamed.status_code, status.HTTP_200_OK)
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+
+    def test_list_genres_modified_by_resolved_names(self):
+        """Test genres created in bulk from names change the ETag."""
+        first = self.client.get(GENRE_URL)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Genre.objects.resolve_names(["Fantasy"])
+        res = self.client.get(GENRE_URL, HTTP_IF_NONE_MATCH=first)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["name"], "Fantasy")
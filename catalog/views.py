@@ -1,25 +1,159 @@
 """
 Views for the Catalog Api
 """
-from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
+from django.db import IntegrityError, transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter
+)
+from rest_framework import viewsets, mixins, serializers
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from catalog import search
+from catalog.cache import aget_catalog_version
 from catalog.models import Genre, Author
+from catalog.pagination import CatalogCursorPagination
 from catalog.serializers import GenreSerializer, AuthorSerializer
+from core.conditional import (
+    conditional_response,
+    make_etag,
+    set_validators
+)
+from core.views import AsyncViewSetMixin
+from user.authentication import SignedTokenAuthentication
 
 
-class BaseCatalogViewSet(mixins.ListModelMixin,
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "fields",
+                OpenApiTypes.STR,
+                description="Comma-separated list of fields to return, "
+                            "e.g. id",
+            )
+        ]
+    )
+)
+class BaseCatalogViewSet(AsyncViewSetMixin,
+                         mixins.ListModelMixin,
                          mixins.UpdateModelMixin,
                          mixins.DestroyModelMixin,
                          viewsets.GenericViewSet):
     """Base view set for recipe attributes"""
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = CatalogCursorPagination
+    suggest_limit = 10
+    max_suggest_limit = 50
 
     def get_queryset(self):
-        return self.queryset.order_by("-name")
+        queryset = self.queryset.order_by("-name")
+
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            # The name is still needed to build the pagination cursor.
+            queryset = queryset.only(*fields, "id", "name")
+
+        return queryset
+
+    async def list(self, request, *args, **kwargs):
+        """List entries, answering 304 while none has changed."""
+        etag = await self.aget_etag(request)
+        response = conditional_response(request, etag)
+        if response is not None:
+            return response
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(
+            queryset, request, view=self
+        )
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        return set_validators(response, etag)
+
+    async def aget_etag(self, request):
+        """Return the ETag of the current entries.
+
+        It is built from the catalog version, bumped by every change, so no
+        query is needed. No Last-Modified is sent: it has whole seconds, so
+        a change in the same second as the previous response would still
+        get a 304.
+        """
+        version = await aget_catalog_version(self.queryset.model)
+        return make_etag(
+            request.path, sorted(request.query_params.lists()), version
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+
+        return super().get_serializer(*args, **kwargs)
+
+    def get_sparse_fields(self):
+        """Return the fields requested with ?fields= when listing."""
+        value = self.request.query_params.get("fields")
+        if self.action != "list" or not value:
+            return None
+
+        fields = [field.strip() for field in value.split(",")]
+        unknown = set(fields) - set(self.serializer_class.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}."]}
+            )
+
+        return fields
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "prefix",
+                OpenApiTypes.STR,
+                required=True,
+                description="Beginning of the name typed so far",
+            ),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description="Maximum number of suggestions (default 10)",
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=False, url_path="suggest")
+    def suggest(self, request):
+        """Suggest names matching a prefix, best matches first."""
+        prefix = request.query_params.get("prefix", "").strip()
+        try:
+            limit = int(request.query_params.get("limit", self.suggest_limit))
+        except ValueError:
+            raise serializers.ValidationError(
+                {"limit": ["A valid integer is required."]}
+            )
+        limit = max(1, min(limit, self.max_suggest_limit))
+
+        if not prefix:
+            return Response([])
+
+        objects = search.suggest(self.queryset, prefix, limit)
+        serializer = self.get_serializer(objects, many=True)
+        return Response(serializer.data)
+
+    def perform_update(self, serializer):
+        """Save the update, rejecting names that already exist."""
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"name": ["An entry with this name already exists."]}
+            )
 
 
 @extend_schema(tags=["Genre"])
@@ -9,6 +9,7 @@ from django.utils.translation import gettext_lazy as _
 from book import models as book_models
 from catalog import models as catalog_models
 from core import models as core_models
+from user import models as user_models
 
 
 class UserAdmin(BaseUserAdmin):
@@ -50,3 +51,4 @@ admin.site.register(core_models.User, UserAdmin)
 admin.site.register(book_models.Book)
 admin.site.register(catalog_models.Author)
 admin.site.register(catalog_models.Genre)
+admin.site.register(user_models.Token)
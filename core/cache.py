@@ -0,0 +1,87 @@
+"""
+In-process caching helpers.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalCache:
+    """Thread-safe LRU cache with a maximum size and per-entry expiry.
+
+    Lives inside a single worker process, so entries are not shared with
+    (nor invalidated by) other workers. Keep the timeout short when the
+    cached data can change.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store value for key, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class LocalCounter:
+    """Thread-safe counts batched in a process before being reported.
+
+    ``add()`` returns the counts collected since the last report once
+    ``interval`` seconds have passed, and an empty dict otherwise, so the
+    caller writes to shared storage only once per interval.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._counts = {}
+        self._reported = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, name, count=1):
+        """Count name, returning the counts due to be reported if any."""
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + count
+            if time.monotonic() - self._reported < self.interval:
+                return {}
+            return self._take()
+
+    def take(self):
+        """Return and reset the counts collected so far."""
+        with self._lock:
+            return self._take()
+
+    def _take(self):
+        counts, self._counts = self._counts, {}
+        self._reported = time.monotonic()
+        return counts
@@ -0,0 +1,32 @@
+"""
+System checks for the deployment settings.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends whose entries every process sees, without a database query.
+SHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Check the default cache is shared by all processes.
+
+    It holds cached tokens, their invalidations and the book list
+    generations, so a process-local cache lets processes serve stale data
+    and a database cache turns every cache hit into queries.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend in SHARED_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            f"The default cache ({backend}) is not a shared cache.",
+            hint="Set CACHE_URL to a Redis or Memcached server.",
+            id="core.E001",
+        )
+    ]
@@ -0,0 +1,25 @@
+"""
+Conditional GET helpers.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+
+
+def make_etag(*parts):
+    """Return a strong ETag built from the given values."""
+    return '"%s"' % hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def conditional_response(request, etag):
+    """Return a 304 response if the client's copy is still current.
+
+    Returns None when the request has to be answered in full.
+    """
+    return get_conditional_response(request, etag=etag)
+
+
+def set_validators(response, etag):
+    """Set the ETag header of a response."""
+    response["ETag"] = etag
+    return response
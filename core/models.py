@@ -39,7 +39,26 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Bumped to revoke the signed tokens issued so far.
+    token_version = models.PositiveIntegerField(default=0)
 
     objects = UserManager()
 
     USERNAME_FIELD = "email"
+
+    def save(self, **kwargs):
+        """Save the user, leaving the token version alone.
+
+        The version is only bumped by ``revoke_signed_tokens()``, so a full
+        save of an existing user must not write back a stale copy of it.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "token_version"
+            ]
+        super().save(**kwargs)
@@ -0,0 +1,136 @@
+"""
+Pagination shared by the APIs.
+"""
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class AsyncCursorPagination(CursorPagination):
+    """Cursor pagination that can also fetch the page with the async ORM.
+
+    Unlike ``CursorPagination``, the cursor holds the values of all the
+    ordering fields, so pages continue after the last row even when the
+    first field has ties (like equal search ranks). End the ordering with a
+    unique field to never fall back to offsets.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of ``paginate_queryset()``."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the query for the requested page, plus one extra item.
+
+        The extra item tells whether a page follows this one.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = self.filter_position(queryset, current_position)
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def filter_position(self, queryset, position):
+        """Keep the rows after the cursor position, in cursor direction."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        # (a, b) after (x, y) is a after x, or a equal to x and b after y.
+        condition = Q()
+        equal = Q()
+        for order, value in zip(self.ordering, values):
+            attr = order.lstrip("-")
+            if self.cursor.reverse != order.startswith("-"):
+                after = Q(**{f"{attr}__lt": value})
+            else:
+                after = Q(**{f"{attr}__gt": value})
+            condition |= equal & after
+            equal &= Q(**{attr: value})
+
+        try:
+            return queryset.filter(condition)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def set_page(self, results):
+        """Keep the page out of the fetched results and set its links."""
+        offset, reverse, current_position = (
+            self.cursor or (0, False, None)
+        )
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            attr = order.lstrip("-")
+            if isinstance(instance, dict):
+                values.append(instance[attr])
+            else:
+                values.append(getattr(instance, attr))
+        return json.dumps(values, cls=DjangoJSONEncoder)
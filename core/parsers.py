@@ -0,0 +1,32 @@
+"""
+Parsers for API requests.
+"""
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from core.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSON parser decoding with orjson when it is installed.
+
+    orjson only reads UTF-8 and always rejects ``NaN`` and ``Infinity``,
+    so other encodings and non-strict parsing fall back to ``JSONParser``.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            orjson is None
+            or not self.strict
+            or encoding.lower().replace("_", "-") not in ("utf-8", "utf8")
+        ):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,149 @@
+"""
+Renderers for API responses and streamed exports.
+"""
+import csv
+import io
+import json
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if orjson is not None:
+    # Dates are left to DRF's encoder, which formats them differently, and
+    # dicts may have non-string keys as with the json module.
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSON renderer encoding with orjson when it is installed.
+
+    The output matches ``JSONRenderer`` for compact UTF-8 JSON: values
+    orjson does not know (such as ``Decimal`` or lazy strings) go through
+    DRF's encoder. Indented output, such as for the browsable API, and
+    data orjson cannot encode fall back to ``JSONRenderer``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped like JSONRenderer does, to stay a strict JavaScript subset.
+        return ret.replace(
+            "\u2028".encode(), b"\\u2028"
+        ).replace("\u2029".encode(), b"\\u2029")
+
+
+class StreamingRenderer(renderers.BaseRenderer):
+    """Base renderer encoding an iterable of rows incrementally.
+
+    ``render_stream()`` (or ``arender_stream()`` for async iterables, as
+    served by ASGI) yields the encoded rows in batches, to be used as the
+    body of a ``StreamingHttpResponse``. ``render()`` handles regular
+    responses such as errors.
+    """
+    batch_size = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"".join(self.render_stream([data]))
+
+    def render_stream(self, rows):
+        """Yield the encoded rows, a batch at a time."""
+        encode = self.get_row_encoder()
+        batch = []
+        for row in rows:
+            batch.append(encode(row))
+            if len(batch) >= self.batch_size:
+                yield "".join(batch).encode(self.charset)
+                batch = []
+        if batch:
+            yield "".join(batch).encode(self.charset)
+
+    async def arender_stream(self, rows):
+        """Async counterpart of ``render_stream()``."""
+        encode = self.get_row_encoder()
+        batch = []
+        async for row in rows:
+            batch.append(encode(row))
+            if len(batch) >= self.batch_size:
+                yield "".join(batch).encode(self.charset)
+                batch = []
+        if batch:
+            yield "".join(batch).encode(self.charset)
+
+    def get_row_encoder(self):
+        """Return a function encoding one row (in order) as text."""
+        raise NotImplementedError
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Render rows as newline-delimited JSON."""
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def get_row_encoder(self):
+        encoder = encoders.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":")
+        )
+        return lambda row: encoder.encode(row) + "\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    """Render rows as CSV with a header taken from the first row.
+
+    Lists of objects are flattened to their names separated by ``|``,
+    other nested values are written as JSON.
+    """
+    media_type = "text/csv"
+    format = "csv"
+
+    def get_row_encoder(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        header = []
+
+        def encode(row):
+            if not header:
+                header.extend(row)
+                writer.writerow(header)
+            writer.writerow([self.flatten(row.get(key)) for key in header])
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return text
+
+        return encode
+
+    def flatten(self, value):
+        """Return a CSV cell for a serialized value."""
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return "|".join(
+                item["name"] if isinstance(item, dict) else str(item)
+                for item in value
+            )
+        if isinstance(value, dict):
+            return json.dumps(value, cls=encoders.JSONEncoder)
+        return value
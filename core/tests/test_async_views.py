@@ -0,0 +1,123 @@
+"""
+Tests for the async read path served through ASGI.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from book.models import Book
+from catalog.models import Author, Genre
+from user.models import Token
+
+BOOK_URL = reverse("book:book-list")
+GENRE_URL = reverse("catalog:genre-list")
+AUTHOR_URL = reverse("catalog:author-list")
+
+
+def detail_url(book_id):
+    """Create and return a book detail URL."""
+    return reverse("book:book-detail", args=[book_id])
+
+
+def create_book(user, **params):
+    """Create and return a book"""
+    defaults = {
+        "title": "Sample book title",
+        "price": Decimal("5.25"),
+        "link": "http://example.com/book.pdf"
+    }
+    defaults.update(params)
+    return Book.objects.create(user=user, **defaults)
+
+
+class AsyncReadTests(TestCase):
+    """Test book and catalog reads through the ASGI handler."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="userpass123"
+        )
+        token = Token.objects.create(user=self.user)
+        self.headers = {"Authorization": f"Token {token.key}"}
+
+    async def test_list_books(self):
+        """Test listing books with the async ORM."""
+        book = await Book.objects.acreate(
+            user=self.user,
+            title="Dune",
+            price=Decimal("5.25"),
+            link="http://example.com/dune.pdf"
+        )
+
+        res = await self.async_client.get(BOOK_URL, headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in res.json()["results"]], [book.id]
+        )
+        self.assertIn("ETag", res)
+
+    async def test_retrieve_book(self):
+        """Test retrieving a book with the async ORM."""
+        book = await Book.objects.acreate(
+            user=self.user,
+            title="Dune",
+            price=Decimal("5.25"),
+            link="http://example.com/dune.pdf"
+        )
+
+        res = await self.async_client.get(
+            detail_url(book.id), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["title"], "Dune")
+
+    def test_retrieve_other_users_book_not_found(self):
+        """Test another user's book is not found by the async lookup."""
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="userpass123"
+        )
+        book = create_book(other)
+
+        res = self.client.get(detail_url(book.id), headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_write_stays_synchronous(self):
+        """Test creating a book still works through the ASGI handler."""
+        res = await self.async_client.post(
+            BOOK_URL,
+            {"title": "Dune", "price": "5.00", "link": "http://a.com/d.pdf"},
+            content_type="application/json",
+            headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            await Book.objects.filter(user=self.user, title="Dune").aexists()
+        )
+
+    async def test_list_catalog(self):
+        """Test listing genres and authors with the async ORM."""
+        await Genre.objects.acreate(name="Fantasy")
+        await Author.objects.acreate(name="Tolkien")
+
+        genres = await self.async_client.get(GENRE_URL, headers=self.headers)
+        authors = await self.async_client.get(
+            AUTHOR_URL, headers=self.headers
+        )
+
+        self.assertEqual(genres.json()["results"][0]["name"], "Fantasy")
+        self.assertEqual(authors.json()["results"][0]["name"], "Tolkien")
+
+        res = await self.async_client.get(
+            GENRE_URL,
+            headers={**self.headers, "If-None-Match": genres["ETag"]}
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,34 @@
+"""
+Tests for the system checks.
+"""
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import check_shared_cache
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """Test the check requiring a shared default cache."""
+
+    def test_local_cache_reported(self):
+        """Test the process-local default cache is an error."""
+        errors = check_shared_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["core.E001"])
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    }})
+    def test_database_cache_reported(self):
+        """Test the database cache is an error."""
+        errors = check_shared_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["core.E001"])
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+    }})
+    def test_redis_cache_passes(self):
+        """Test Redis passes the check."""
+        self.assertEqual(check_shared_cache(None), [])
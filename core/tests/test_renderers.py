@@ -0,0 +1,105 @@
+"""
+Tests for the JSON renderer and parser.
+"""
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+PAYLOAD = {
+    "results": [
+        ReturnDict({
+            "id": 1,
+            "title": "Dünë \u2028\u2029 \U0001F4DA",
+            "price": Decimal("5.50"),
+            "image": "http://testserver/media/uploads/book/ab/ab.jpg",
+            "genres": [{"id": 2, "name": "Sci-Fi"}],
+            "rating": 4.25,
+            "missing": None,
+        }, serializer=None),
+    ],
+    "updated_at": datetime.datetime(
+        2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "published": datetime.date(2024, 5, 1),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "detail": gettext_lazy("Not found."),
+    "counts": {1: "one"},
+    "tags": ("a", "b"),
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test the JSON renderer."""
+
+    def test_output_matches_json_renderer(self):
+        """Test the output is identical to DRF's JSONRenderer."""
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD)
+        )
+
+    def test_indented_output_matches_json_renderer(self):
+        """Test indented output falls back to JSONRenderer."""
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type)
+        )
+
+    def test_without_orjson(self):
+        """Test rendering falls back to the json module."""
+        with patch("core.renderers.orjson", None):
+            output = FastJSONRenderer().render(PAYLOAD)
+        self.assertEqual(output, JSONRenderer().render(PAYLOAD))
+
+    def test_unsupported_value_falls_back(self):
+        """Test integers orjson cannot encode are rendered by json."""
+        data = {"big": 2 ** 70}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Test the JSON parser."""
+
+    def parse(self, body, **context):
+        return FastJSONParser().parse(
+            io.BytesIO(body), "application/json", context
+        )
+
+    def test_parse(self):
+        """Test parsing a UTF-8 request body."""
+        data = self.parse('{"title": "Dünë", "price": "5.50"}'.encode())
+        self.assertEqual(data, {"title": "Dünë", "price": "5.50"})
+
+    def test_parse_error(self):
+        """Test invalid JSON raises a parse error."""
+        with self.assertRaises(ParseError):
+            self.parse(b'{"title": ')
+
+    def test_nan_rejected(self):
+        """Test NaN is rejected like the strict JSONParser does."""
+        with self.assertRaises(ParseError):
+            self.parse(b'{"price": NaN}')
+
+    def test_other_encoding(self):
+        """Test bodies in other encodings fall back to JSONParser."""
+        body = '{"title": "Dünë"}'.encode("utf-16")
+        self.assertEqual(
+            self.parse(body, encoding="utf-16"), {"title": "Dünë"}
+        )
@@ -0,0 +1,92 @@
+"""
+Shared helpers for API views.
+"""
+import asyncio
+import inspect
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+
+
+class AsyncAPIViewMixin:
+    """Allow an ``APIView`` to implement its handlers as coroutines.
+
+    DRF dispatches synchronously, so this mirrors ``APIView.dispatch()`` as
+    a coroutine. The authentication, permission and throttling checks run
+    through ``sync_to_async``; handlers have to await any other blocking
+    work, such as database queries, themselves. Requests for synchronous
+    handlers go through the regular dispatch in a thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        # Schema decorators may wrap handlers in plain functions.
+        if not asyncio.iscoroutinefunction(inspect.unwrap(handler)):
+            return await sync_to_async(super().dispatch)(
+                request, *args, **kwargs
+            )
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+
+class AsyncViewSetMixin(AsyncAPIViewMixin):
+    """Allow a ``ViewSet`` to implement some of its actions as coroutines.
+
+    The view functions built for the router are async; actions that are
+    still synchronous (such as writes) run in a thread as usual.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return update_wrapper(async_view, view)
+
+    async def aget_object(self):
+        """Return the object the view is displaying, like ``get_object()``."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (
+            queryset.model.DoesNotExist, TypeError, ValueError, ValidationError
+        ):
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given "
+                f"query."
+            )
+
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,211 @@
+"""
+Authentication for the APIs.
+"""
+import pickle
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core.cache import LocalCache
+from user.models import Token
+
+SIGNED_TOKEN_SALT = "user.signed-token"
+
+local_tokens = LocalCache(
+    max_size=settings.TOKEN_AUTH_LOCAL_CACHE_SIZE,
+    timeout=settings.TOKEN_AUTH_LOCAL_CACHE_TIMEOUT
+)
+local_users = LocalCache(
+    max_size=settings.TOKEN_AUTH_LOCAL_CACHE_SIZE,
+    timeout=settings.TOKEN_AUTH_LOCAL_CACHE_TIMEOUT
+)
+
+
+def token_cache_key(key):
+    """Return the shared cache key for a token."""
+    return f"auth-token:{key}"
+
+
+def token_refresh_key(key):
+    """Return the shared cache key marking a recently refreshed token."""
+    return f"auth-token-refreshed:{key}"
+
+
+def invalidate_tokens(*keys):
+    """Drop tokens from this process's cache and the shared cache."""
+    for key in keys:
+        local_tokens.delete(key)
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+def user_cache_key(user_id):
+    """Return the shared cache key for a user of signed tokens."""
+    return f"auth-user:{user_id}"
+
+
+def invalidate_users(*user_ids):
+    """Drop users from this process's cache and the shared cache."""
+    for user_id in user_ids:
+        local_users.delete(user_id)
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+def revoke_signed_tokens(*user_ids):
+    """Invalidate all signed tokens issued so far to the given users."""
+    get_user_model()._default_manager.filter(pk__in=user_ids).update(
+        token_version=F("token_version") + 1
+    )
+    invalidate_users(*user_ids)
+
+
+def issue_signed_token(user):
+    """Return a signed token for a user and the time it expires.
+
+    The claims are the user id, the expiry (a Unix timestamp) and the
+    token version of the user.
+    """
+    expires = int(time.time()) + settings.SIGNED_TOKEN_MAX_AGE
+    token = signing.dumps(
+        {"uid": user.pk, "exp": expires, "ver": user.token_version},
+        salt=SIGNED_TOKEN_SALT
+    )
+    return token, expires
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches resolved tokens.
+
+    A token is looked up in a per-process LRU first, then in Django's
+    cache, and only queried from the database when both miss. Entries are
+    stored pickled so every request gets its own user instance.
+
+    Expired tokens are rejected. Using a token slides its expiry, but its
+    ``last_used`` is written at most once per TOKEN_REFRESH_INTERVAL, not
+    on every request.
+    """
+    model = Token
+
+    def authenticate_credentials(self, key):
+        token = self.get_cached_token(key)
+        if token.is_expired():
+            # The cached copy may predate a refresh by another process.
+            invalidate_tokens(key)
+            token = self.get_cached_token(key)
+            if token.is_expired():
+                raise exceptions.AuthenticationFailed(_("Token has expired."))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        self.refresh_token(token)
+        return (token.user, token)
+
+    def get_cached_token(self, key):
+        """Return the token from the caches, loading it on a miss."""
+        pickled = local_tokens.get(key)
+        if pickled is None:
+            pickled = cache.get(token_cache_key(key))
+            if pickled is None:
+                pickled = self.cache_token(self.get_token(key))
+            else:
+                local_tokens.set(key, pickled)
+
+        return pickle.loads(pickled)
+
+    def cache_token(self, token):
+        """Store a token in both caches, returning it pickled."""
+        pickled = pickle.dumps(token)
+        cache.set(
+            token_cache_key(token.key),
+            pickled,
+            settings.TOKEN_AUTH_CACHE_TIMEOUT
+        )
+        local_tokens.set(token.key, pickled)
+        return pickled
+
+    def refresh_token(self, token):
+        """Record the use of a token if it was not recorded lately."""
+        now = timezone.now()
+        interval = settings.TOKEN_REFRESH_INTERVAL
+        if (now - token.last_used).total_seconds() < interval:
+            return
+
+        # Only one process per interval gets to write.
+        if not cache.add(token_refresh_key(token.key), True, interval):
+            return
+
+        self.model.objects.filter(pk=token.pk).update(last_used=now)
+        token.last_used = now
+        self.cache_token(token)
+
+    def get_token(self, key):
+        """Load the token and its user from the database."""
+        model = self.get_model()
+        try:
+            return model.objects.select_related("user").get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+
+class SignedTokenAuthentication(CachedTokenAuthentication):
+    """Authentication with stateless tokens of ``issue_signed_token()``.
+
+    Tokens are verified by their signature and expiry, and against the
+    ``token_version`` of their user, which is cached like the database
+    tokens: a cache hit needs no database query, a miss reloads the user.
+    Bumping the version revokes the tokens issued so far.
+
+    Database tokens are still accepted, as by ``CachedTokenAuthentication``.
+    """
+
+    def authenticate_credentials(self, key):
+        if ":" not in key:
+            return super().authenticate_credentials(key)
+
+        try:
+            claims = signing.loads(key, salt=SIGNED_TOKEN_SALT)
+        except signing.BadSignature:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if claims["exp"] <= time.time():
+            raise exceptions.AuthenticationFailed(_("Token has expired."))
+
+        user = self.get_cached_user(claims["uid"])
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        if user.token_version != claims["ver"]:
+            raise exceptions.AuthenticationFailed(_("Token has been revoked."))
+
+        return (user, claims)
+
+    def get_cached_user(self, user_id):
+        """Return the user from the caches, loading it on a miss."""
+        pickled = local_users.get(user_id)
+        if pickled is None:
+            pickled = cache.get(user_cache_key(user_id))
+            if pickled is None:
+                pickled = pickle.dumps(self.get_user(user_id))
+                cache.set(
+                    user_cache_key(user_id),
+                    pickled,
+                    settings.TOKEN_AUTH_CACHE_TIMEOUT
+                )
+            local_users.set(user_id, pickled)
+
+        return pickle.loads(pickled)
+
+    def get_user(self, user_id):
+        """Load the user from the database."""
+        User = get_user_model()
+        try:
+            return User._default_manager.get(pk=user_id)
+        except User.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
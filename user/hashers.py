@@ -0,0 +1,17 @@
+"""
+Password hashers.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 hasher with the work factor set by PASSWORD_HASH_ITERATIONS.
+
+    Hashes with another iteration count are replaced on the next successful
+    login, so lowering (or raising) the setting migrates users gradually.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS or super().iterations
@@ -0,0 +1,112 @@
+"""
+Credential checks for issuing auth tokens.
+
+Password hashing is CPU bound, so it runs in a bounded thread pool rather
+than on the event loop, and repeated failures with the same credentials
+are answered from the cache without hashing again.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.cache import cache
+from django.utils.crypto import salted_hmac
+
+# Failed passwords remembered per email.
+MAX_REMEMBERED_FAILURES = 20
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared thread pool hashing passwords."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.LOGIN_HASH_WORKERS,
+                thread_name_prefix="login"
+            )
+    return _executor
+
+
+async def run_hasher(func, *args):
+    """Run a password hashing function in the thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), func, *args)
+
+
+def credential_id(email):
+    """Return an opaque identifier of an email, ignoring case."""
+    return salted_hmac("user.login.email", email.strip().lower()).hexdigest()
+
+
+def failures_key(email):
+    """Return the cache key of the failed passwords for an email."""
+    return f"login-failures:{credential_id(email)}"
+
+
+def failure_digest(email, password):
+    """Return the digest remembering a failed email and password pair."""
+    return salted_hmac(
+        "user.login.password", f"{email}\0{password}"
+    ).hexdigest()
+
+
+async def is_known_failure(email, password):
+    """Return whether these credentials failed recently."""
+    failures = await cache.aget(failures_key(email), ())
+    return failure_digest(email, password) in failures
+
+
+async def remember_failure(email, password):
+    """Remember failed credentials for LOGIN_FAILURE_CACHE_TIMEOUT."""
+    key = failures_key(email)
+    failures = list(await cache.aget(key, ()))
+    failures.append(failure_digest(email, password))
+    await cache.aset(
+        key,
+        failures[-MAX_REMEMBERED_FAILURES:],
+        settings.LOGIN_FAILURE_CACHE_TIMEOUT
+    )
+
+
+def forget_failures(email):
+    """Forget the failed passwords of an email, e.g. after it changed."""
+    cache.delete(failures_key(email))
+
+
+async def check_credentials(email, password):
+    """Return the active user with these credentials, or None.
+
+    Stale password hashes (of another hasher or work factor) are replaced
+    by one of the preferred hasher once the password is verified.
+    """
+    if await is_known_failure(email, password):
+        return None
+
+    User = get_user_model()
+    user = await User._default_manager.filter(
+        **{User.USERNAME_FIELD: email}
+    ).afirst()
+    # Unknown emails are hashed too, taking as long as wrong passwords.
+    valid, must_update = await run_hasher(
+        verify_password, password, user.password if user else ""
+    )
+    if not valid or not user.is_active:
+        await remember_failure(email, password)
+        return None
+
+    if must_update:
+        encoded = await run_hasher(make_password, password)
+        await User._default_manager.filter(
+            pk=user.pk, password=user.password
+        ).aupdate(password=encoded)
+        user.password = encoded
+
+    return user
@@ -0,0 +1,41 @@
+"""
+Django command to delete expired auth tokens.
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from user.models import Token
+
+
+class Command(BaseCommand):
+    """Django command to delete expired auth tokens."""
+
+    help = "Delete auth tokens unused for longer than TOKEN_EXPIRY."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tokens to delete per query (default 1000).",
+        )
+
+    def handle(self, *args, **options):
+        # A fixed cutoff, so tokens expiring meanwhile don't keep it going.
+        expired = Token.objects.expired(timezone.now())
+        deleted = 0
+        while True:
+            # Batches are found through the last_used index and deleted
+            # in short transactions, instead of one long DELETE.
+            keys = list(
+                expired.order_by("last_used").values_list(
+                    "pk", flat=True
+                )[:options["batch_size"]]
+            )
+            if not keys:
+                break
+            deleted += expired.filter(pk__in=keys).delete()[0]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired tokens")
+        )
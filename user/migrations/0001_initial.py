@@ -0,0 +1,70 @@
+# Generated by Django 5.2.1 on 2026-10-17 07:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+LEGACY_TABLE = "authtoken_token"
+
+
+def copy_legacy_tokens(apps, schema_editor):
+    """Copy the tokens of rest_framework.authtoken, which is replaced.
+
+    Their expiry starts now. The old table is kept for rolling back.
+    """
+    connection = schema_editor.connection
+    if LEGACY_TABLE not in connection.introspection.table_names():
+        return
+
+    token_model = apps.get_model("user", "Token")
+    table = schema_editor.quote_name(token_model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (key, user_id, created, last_used) "
+            f"SELECT key, user_id, created, now() FROM {LEGACY_TABLE}"
+        )
+
+
+def restore_legacy_tokens(apps, schema_editor):
+    """Copy the current tokens back to the rest_framework.authtoken table."""
+    connection = schema_editor.connection
+    if LEGACY_TABLE not in connection.introspection.table_names():
+        return
+
+    token_model = apps.get_model("user", "Token")
+    table = schema_editor.quote_name(token_model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {LEGACY_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {LEGACY_TABLE} (key, user_id, created) "
+            f"SELECT key, user_id, created FROM {table}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Token',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='Key')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('last_used', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='auth_token', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Token',
+                'verbose_name_plural': 'Tokens',
+                'abstract': False,
+                'indexes': [models.Index(fields=['last_used'], name='token_last_used_idx')],
+            },
+        ),
+        migrations.RunPython(copy_legacy_tokens, restore_legacy_tokens),
+    ]
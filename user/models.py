@@ -0,0 +1,45 @@
+"""
+Database models for authentication.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework.authtoken import models as authtoken_models
+
+
+class TokenQuerySet(models.QuerySet):
+    """QuerySet for auth tokens."""
+
+    def expired(self, now=None):
+        """Return the tokens unused for longer than TOKEN_EXPIRY."""
+        now = now or timezone.now()
+        return self.filter(
+            last_used__lte=now - timedelta(seconds=settings.TOKEN_EXPIRY)
+        )
+
+
+class Token(authtoken_models.Token):
+    """Auth token expiring once unused for TOKEN_EXPIRY seconds.
+
+    ``last_used`` slides forward as the token is used, written at most
+    once per TOKEN_REFRESH_INTERVAL (see ``CachedTokenAuthentication``).
+    """
+    last_used = models.DateTimeField(default=timezone.now)
+
+    objects = TokenQuerySet.as_manager()
+
+    class Meta(authtoken_models.Token.Meta):
+        indexes = [
+            models.Index(fields=["last_used"], name="token_last_used_idx"),
+        ]
+
+    @property
+    def expires(self):
+        """Return when the token expires unless it is used again."""
+        return self.last_used + timedelta(seconds=settings.TOKEN_EXPIRY)
+
+    def is_expired(self, now=None):
+        """Return whether the token has expired."""
+        return (now or timezone.now()) >= self.expires
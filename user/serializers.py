@@ -1,13 +1,13 @@
 """
 Serializers for the user API View.
 """
-from django.contrib.auth import (
-    get_user_model,
-    authenticate
-)
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
 
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from user.login import check_credentials
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -42,18 +42,21 @@ class AuthTokenSerializer(serializers.Serializer):
         trim_whitespace=False
     )
 
-    def validate(self, attrs):
-        """Validate and authenticate the user."""
-        email = attrs.get("email")
-        password = attrs.get("password")
-        user = authenticate(
-            request=self.context.get("request"),
-            username=email,
-            password=password
+    async def authenticate(self):
+        """Return the user of the validated credentials.
+
+        Runs the password check in the login thread pool, so the caller
+        awaits it instead of blocking on the hash.
+        """
+        user = await check_credentials(
+            self.validated_data["email"],
+            self.validated_data["password"]
         )
         if not user:
             msg = _("Unable to authenticate with provided credentials.")
-            raise serializers.ValidationError(msg, code="authorization")
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [msg]},
+                code="authorization"
+            )
 
-        attrs["user"] = user
-        return attrs
+        return user
@@ -0,0 +1,46 @@
+"""
+Signal handlers keeping cached authentication up to date.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import (
+    invalidate_tokens,
+    invalidate_users,
+    revoke_signed_tokens
+)
+from user.login import forget_failures
+from user.models import Token
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Stop accepting a deleted token."""
+    invalidate_tokens(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, **kwargs):
+    """Refresh cached tokens and failed logins of a changed user.
+
+    Signed tokens are revoked when the password changes (``_password`` is
+    set until the save completes) or the user is deactivated.
+    """
+    forget_failures(instance.email)
+    if created:
+        return
+
+    if instance._password is not None or not instance.is_active:
+        revoke_signed_tokens(instance.pk)
+    else:
+        invalidate_users(instance.pk)
+
+    keys = Token.objects.filter(user=instance).values_list("key", flat=True)
+    invalidate_tokens(*keys)
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_deleted(sender, instance, **kwargs):
+    """Stop accepting signed tokens of a deleted user."""
+    invalidate_users(instance.pk)
@@ -0,0 +1,285 @@
+"""
+Tests for the cached token authentication.
+"""
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import LocalCache
+from user.authentication import local_tokens, local_users
+from user.models import Token
+
+ME_URL = reverse("user:me")
+TOKEN_URL = reverse("user:token")
+
+
+class LocalCacheTests(TestCase):
+    """Test the in-process LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted when full."""
+        local = LocalCache(max_size=2, timeout=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("c"), 3)
+
+    def test_entries_expire(self):
+        """Test entries are dropped after the timeout."""
+        local = LocalCache(max_size=2, timeout=60)
+        local.set("a", 1)
+
+        expired = time.monotonic() + 61
+        with patch("core.cache.time.monotonic", return_value=expired):
+            self.assertIsNone(local.get("a"))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating with cached tokens."""
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123",
+            name="Test Name"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_token_lookup_is_cached(self):
+        """Test only the first request queries the token."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_shared_cache_used_when_local_cache_misses(self):
+        """Test another worker's cached token avoids the database."""
+        self.client.get(ME_URL)
+        local_tokens.clear()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_invalid_token_rejected(self):
+        """Test an unknown token is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_rejected(self):
+        """Test a cached token stops working once deleted."""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test a cached token stops working when its user is deactivated."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_updated_user_not_stale(self):
+        """Test changes to the user are visible on the next request."""
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {"name": "New Name"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["name"], "New Name")
+
+
+@override_settings(TOKEN_EXPIRY=3600, TOKEN_REFRESH_INTERVAL=60)
+class TokenExpiryTests(TestCase):
+    """Test expiring and refreshing tokens."""
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def set_last_used(self, seconds_ago):
+        last_used = timezone.now() - timedelta(seconds=seconds_ago)
+        Token.objects.filter(pk=self.token.pk).update(last_used=last_used)
+        return last_used
+
+    def test_expired_token_rejected(self):
+        """Test a token unused for longer than the expiry is rejected."""
+        self.set_last_used(3601)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_use_refreshes_at_most_once_per_interval(self):
+        """Test last_used is written once per refresh interval."""
+        last_used = self.set_last_used(120)
+
+        with self.assertNumQueries(2):
+            self.client.get(ME_URL)
+        self.token.refresh_from_db()
+        self.assertGreater(self.token.last_used, last_used)
+
+        local_tokens.clear()
+        cache.delete(f"auth-token:{self.token.key}")
+        self.set_last_used(120)
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_stale_cached_token_reloaded(self):
+        """Test a cached copy expired by now is checked against the db."""
+        self.set_last_used(3000)
+        self.client.get(ME_URL)
+        Token.objects.filter(pk=self.token.pk).update(
+            last_used=timezone.now()
+        )
+
+        expired = timezone.now() + timedelta(seconds=700)
+        with patch("user.models.timezone.now", return_value=expired):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_login_rotates_expired_token(self):
+        """Test requesting a token replaces an expired one."""
+        self.set_last_used(3601)
+
+        res = self.client.post(
+            TOKEN_URL,
+            {"email": "user@example.com", "password": "testpass123"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data["token"], self.token.key)
+        self.assertFalse(Token.objects.filter(pk=self.token.pk).exists())
+
+    def test_purge_tokens(self):
+        """Test the purge command deletes only expired tokens."""
+        other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="testpass123"
+        )
+        fresh = Token.objects.create(user=other)
+        self.set_last_used(3601)
+
+        call_command("purge_tokens", "--batch-size=1", stdout=StringIO())
+
+        self.assertEqual(list(Token.objects.all()), [fresh])
+
+
+@override_settings(SIGNED_TOKENS=True, SIGNED_TOKEN_MAX_AGE=900)
+class SignedTokenAuthenticationTests(TestCase):
+    """Test authenticating with signed tokens."""
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123"
+        )
+        self.client = APIClient()
+        res = self.client.post(
+            TOKEN_URL,
+            {"email": "user@example.com", "password": "testpass123"}
+        )
+        self.token = res.data["token"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+    def test_signed_token_issued(self):
+        """Test the token endpoint issues signed tokens, not db tokens."""
+        self.assertIn(":", self.token)
+        self.assertFalse(Token.objects.exists())
+
+    def test_verified_without_queries(self):
+        """Test requests with a signed token need no database query."""
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        local_users.clear()
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.data["email"], "user@example.com")
+
+    def test_tampered_token_rejected(self):
+        """Test a token with a bad signature is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}x")
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_token_rejected(self):
+        """Test a token is rejected after its expiry."""
+        expired = time.time() + 901
+        with patch("user.authentication.time.time", return_value=expired):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_tokens(self):
+        """Test changing the password revokes issued tokens."""
+        res = self.client.patch(ME_URL, {"password": "newpass123"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_change_keeps_tokens(self):
+        """Test other changes to the user keep tokens valid but fresh."""
+        self.client.patch(ME_URL, {"name": "New Name"})
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["name"], "New Name")
+
+    def test_evicted_version_reloaded(self):
+        """Test tokens stay valid once the cached user is evicted."""
+        cache.clear()
+        local_users.clear()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_stale_save_keeps_tokens_revoked(self):
+        """Test saving a user loaded before a revocation keeps it."""
+        stale = get_user_model().objects.get(pk=self.user.pk)
+        self.client.patch(ME_URL, {"password": "newpass123"})
+
+        stale.name = "New Name"
+        stale.save()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
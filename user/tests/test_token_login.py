@@ -0,0 +1,128 @@
+"""
+Tests for issuing auth tokens.
+"""
+import asyncio
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import verify_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user.throttling import LoginRateThrottle
+
+TOKEN_URL = reverse("user:token")
+
+
+class TokenLoginTests(TestCase):
+    """Test the password checks of the token endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com",
+            password="testpass123"
+        )
+
+    def login(self, password="testpass123", email="user@example.com"):
+        return self.client.post(
+            TOKEN_URL, {"email": email, "password": password}
+        )
+
+    def test_password_hashed_in_pool(self):
+        """Test the password is checked on a login pool thread."""
+        threads = []
+
+        def check(*args):
+            threads.append(threading.current_thread().name)
+            return verify_password(*args)
+
+        with patch("user.login.verify_password", side_effect=check):
+            res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("token", res.data)
+        self.assertTrue(threads[0].startswith("login"))
+
+    async def test_concurrent_logins(self):
+        """Test logins served by the ASGI handler run concurrently."""
+        responses = await asyncio.gather(*[
+            self.async_client.post(
+                TOKEN_URL,
+                {"email": "user@example.com", "password": "testpass123"}
+            )
+            for _ in range(3)
+        ])
+
+        tokens = {res.json()["token"] for res in responses}
+        self.assertEqual(len(tokens), 1)
+
+    def test_repeated_failure_not_hashed(self):
+        """Test a repeated bad password is rejected from the cache."""
+        with patch(
+            "user.login.verify_password", wraps=verify_password
+        ) as verify:
+            for _ in range(3):
+                res = self.login("wrongpass")
+                self.assertEqual(
+                    res.status_code, status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn("non_field_errors", res.data)
+
+        self.assertEqual(verify.call_count, 1)
+
+    def test_unknown_email_rejected(self):
+        """Test unknown emails are rejected after hashing anyway."""
+        with patch(
+            "user.login.verify_password", wraps=verify_password
+        ) as verify:
+            res = self.login(email="other@example.com")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        verify.assert_called_once()
+
+    def test_inactive_user_rejected(self):
+        """Test inactive users get no token."""
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.login()
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_password_change_forgets_failures(self):
+        """Test a password that failed works once it is set."""
+        self.login("newpass123")
+        self.user.set_password("newpass123")
+        self.user.save()
+
+        res = self.login("newpass123")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_stale_hash_rehashed(self):
+        """Test hashes of another work factor are replaced on login."""
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            res = self.login()
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.user.refresh_from_db()
+            self.assertTrue(
+                self.user.password.startswith("pbkdf2_sha256$1000$")
+            )
+            self.assertTrue(self.user.check_password("testpass123"))
+
+    @patch.object(LoginRateThrottle, "THROTTLE_RATES", {"login": "2/min"})
+    def test_throttled_per_email(self):
+        """Test token requests are limited per email."""
+        self.login("wrongpass")
+        self.login("wrongpass2")
+
+        res = self.login()
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        res = self.login(email="OTHER@example.com")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,25 @@
+"""
+Throttles for the user API.
+"""
+from rest_framework.throttling import SimpleRateThrottle
+
+from user.login import credential_id
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """Limit token requests per email, whoever sends them.
+
+    Uses the ``login`` rate of ``DEFAULT_THROTTLE_RATES``.
+    """
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": credential_id(email)
+        }
@@ -1,15 +1,24 @@
 """
 Views for the user API.
 """
+from django.conf import settings
 from drf_spectacular.utils import extend_schema
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from core.views import AsyncAPIViewMixin
+from user.authentication import (
+    SignedTokenAuthentication,
+    issue_signed_token
+)
+from user.models import Token
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer
 )
+from user.throttling import LoginRateThrottle
 
 
 @extend_schema(tags=["User"])
@@ -22,7 +31,7 @@ class CreateUserView(generics.CreateAPIView):
 class ManageUserViews(generics.RetrieveUpdateAPIView):
     """Mange the authenticated user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -31,7 +40,26 @@ class ManageUserViews(generics.RetrieveUpdateAPIView):
 
 
 @extend_schema(tags=["User"])
-class CreateTokenView(ObtainAuthToken):
+class CreateTokenView(AsyncAPIViewMixin, ObtainAuthToken):
     """Create a new auth token for user."""
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    authentication_classes = []
+    throttle_classes = [LoginRateThrottle]
+
+    # Async, so the server keeps handling other requests while the
+    # password is hashed in the login thread pool.
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = await serializer.authenticate()
+        if settings.SIGNED_TOKENS:
+            token, expires = issue_signed_token(user)
+            return Response({"token": token, "expires": expires})
+
+        token, created = await Token.objects.aget_or_create(user=user)
+        if token.is_expired():
+            # Rotate: an expired token is replaced instead of revived.
+            await token.adelete()
+            token = await Token.objects.acreate(user=user)
+        return Response({"token": token.key})